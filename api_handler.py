@@ -1,5 +1,6 @@
 # api_handler.py
 from __future__ import annotations
+import threading
 from typing import Any, List, Optional, Tuple
 
 try:
@@ -7,6 +8,20 @@ try:
 except ImportError:
     openai = None  # type: ignore
 
+# Rate-limited (429) and transient 5xx calls are retried by the SDK with
+# exponential backoff and jitter, honouring any Retry-After header, before
+# the error reaches the caller.
+DEFAULT_MAX_RETRIES = 4
+
+# Upper bound on API requests in flight at once from this process.  The
+# generator is shared by every request thread, so a burst of users queues
+# here instead of tripping the account's rate limit.
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# Seconds a request waits for one of those slots before giving up, so a
+# stalled upstream surfaces as an error instead of hanging every worker.
+DEFAULT_REQUEST_SLOT_TIMEOUT = 120.0
+
 
 class OpenAIUnifiedGenerator:
     """
@@ -20,7 +35,15 @@ class OpenAIUnifiedGenerator:
     Compatible with OpenAI Python SDK >= 1.0.
     """
 
-    def __init__(self, model_name: str, api_key: str, default_max_tokens: int = 512) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        api_key: str,
+        default_max_tokens: int = 512,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        max_concurrent_requests: Optional[int] = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        request_slot_timeout: float = DEFAULT_REQUEST_SLOT_TIMEOUT,
+    ) -> None:
         if openai is None:
             raise RuntimeError("Install the 'openai' package to use the API backend.")
         self.model_name = (model_name or "").strip()
@@ -30,7 +53,14 @@ class OpenAIUnifiedGenerator:
         client_cls = getattr(openai, "OpenAI", None)
         if client_cls is None:
             raise RuntimeError("OpenAI client not available. Update the 'openai' package.")
-        self._client = client_cls(api_key=self.api_key)
+        self._client = client_cls(api_key=self.api_key, max_retries=max(0, int(max_retries)))
+        # ``None`` or a non-positive limit disables the throttle.
+        self._request_slots = (
+            threading.BoundedSemaphore(int(max_concurrent_requests))
+            if max_concurrent_requests and int(max_concurrent_requests) > 0
+            else None
+        )
+        self._request_slot_timeout = float(request_slot_timeout)
 
     # ---------------- heuristics ----------------
     def _uses_responses_api(self) -> bool:
@@ -60,13 +90,34 @@ class OpenAIUnifiedGenerator:
         max_new_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
+        stop_after_json: bool = False,
     ) -> str:
+        # ``stop_after_json`` is accepted for interface parity with the local
+        # TextGenerator; the API returns complete responses in one round trip.
         if not isinstance(prompt, str) or not prompt.strip():
             raise ValueError("prompt must be a non-empty string.")
         max_tokens = int(max_new_tokens if max_new_tokens is not None else self.default_max_tokens)
         if max_tokens <= 0:
             raise ValueError("max_new_tokens must be positive.")
 
+        if self._request_slots is None:
+            return self._dispatch(prompt, max_tokens, temperature, top_p)
+        if not self._request_slots.acquire(timeout=self._request_slot_timeout):
+            raise RuntimeError(
+                "Too many OpenAI requests are already in flight; please try again shortly."
+            )
+        try:
+            return self._dispatch(prompt, max_tokens, temperature, top_p)
+        finally:
+            self._request_slots.release()
+
+    def _dispatch(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: Optional[float],
+        top_p: Optional[float],
+    ) -> str:
         if self._uses_responses_api():
             return self._call_responses(prompt, max_tokens, temperature, top_p)
         if self._uses_chat_completions():
@@ -11,41 +11,87 @@ Run the application with ``flask --app chat_interface run`` after exporting
 """
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import json
+import queue
 import re
+import threading
 import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
-from api_handler import OpenAIUnifiedGenerator
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from datetime import datetime
+from functools import lru_cache
 
+import click
 from flask import (
     Flask,
+    Response,
     abort,
+    current_app,
     jsonify,
     redirect,
     render_template,
     request,
     session,
+    stream_with_context,
     url_for,
 )
+from flask.json.provider import DefaultJSONProvider
+from flask.sessions import SecureCookieSessionInterface
 from flask_sqlalchemy import SQLAlchemy
 
-from sqlalchemy import inspect, text
+from sqlalchemy import DDL, delete, event, insert, inspect, select
+from sqlalchemy.orm import load_only, selectinload
+from sqlalchemy.pool import QueuePool
+
+try:  # Server-side sessions keep long chat histories out of the cookie.
+    from flask_session import Session  # type: ignore
+except ImportError:  # pragma: no cover - fall back to signed cookie sessions
+    Session = None  # type: ignore
 
-import torch
+try:  # Optional Redis backend for server-side sessions.
+    import redis  # type: ignore
+except ImportError:  # pragma: no cover - sessions stay in the database
+    redis = None  # type: ignore
+
+try:  # ``orjson`` is an optional, faster drop-in for model and column JSON.
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - fall back to the standard library
+    orjson = None  # type: ignore
 
 LOGGER = logging.getLogger(__name__)
 
-from text_generator import TextGenerator
 from system_prompts import (
     SYSTEM_PROMPTS,
     get_character_fields,
     get_character_input_fields,
 )
 
+# ``torch``/``transformers`` (via ``text_generator``) and the OpenAI SDK are
+# slow to import, so they are only loaded once a backend is first used.
+if TYPE_CHECKING:  # pragma: no cover - imports for annotations only
+    from api_handler import OpenAIUnifiedGenerator
+    from text_generator import TextGenerator
+
 
 GENRE_CHOICES: Sequence[Tuple[str, str]] = (
     ("Fantasy", "Fantasy"),
@@ -100,6 +146,9 @@ REALISM_CHOICES: Sequence[Tuple[str, str]] = (
     ("Alternate history", "Alternate history"),
 )
 
+ACT_LABELS: Mapping[int, str] = {1: "Act I", 2: "Act II", 3: "Act III"}
+ACT_LABEL_SEQUENCE: Tuple[str, ...] = tuple(ACT_LABELS.values())
+
 SEED_PROMPT_TEMPLATE = """You are a professional story concept developer. Your task is to take a user’s vague or partial story idea plus structured metadata (genre, tone, stakes, themes, audience, etc.) and expand it into a fully-fledged, high-quality novel seed prompt.
 
 Your output is NOT an outline and NOT a story.
@@ -250,13 +299,45 @@ DEFAULT_SECRET = "dev-secret-key-change-me"
 
 # ``TextGenerator`` is expensive to initialise, so cache a single instance per
 # process.  It loads lazily on the first request that needs it.
-_generator: TextGenerator | None = None
+_generator: _BatchingTextGenerator | None = None
+_generator_lock = threading.Lock()
+
+# Concurrent local generations are coalesced for up to this long and run as
+# one batched ``generate`` call of at most this many prompts.
+_LOCAL_BATCH_WINDOW_SECONDS = 0.01
+_LOCAL_BATCH_MAX_SIZE = 8
 
 # Cache for the optional OpenAI API backend.  The configuration is loaded from
 # ``openai_config.json`` when the user explicitly opts-in via the UI.
 _openai_generator: OpenAIUnifiedGenerator | None = None
 _openai_signature: Tuple[str, str] | None = None
 _OPENAI_CONFIG_PATH = Path(__file__).resolve().parent / "openai_config.json"
+# Parsed ``openai_config.json`` keyed by the file's mtime, so API-backed
+# requests only pay for a ``stat`` while the file is unchanged.
+_openai_config_cache: Tuple[int, Optional[Dict[str, str]]] | None = None
+
+# Exact-match cache for generated stage content, keyed by a digest of the
+# stage, prompt and backend.  Entries are only stored for backends sampling at
+# a low temperature (set LOCAL_GPT_TEMPERATURE to 0.2 or less); otherwise
+# regenerating is expected to give a fresh draft.
+_RESPONSE_CACHE: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+_RESPONSE_CACHE_MAX_ENTRIES = 512
+_RESPONSE_CACHE_MAX_TEMPERATURE = 0.2
+DEFAULT_RESPONSE_CACHE_TTL_SECONDS = 3600
+
+# Generations currently running, keyed by backend, prompt and generation
+# settings, so identical concurrent requests (e.g. a double-clicked "Analyse")
+# share one LLM call.  Followers give up after the timeout rather than block
+# forever behind a leader whose backend call has hung.
+_INFLIGHT_GENERATIONS: Dict[bytes, "Future[str]"] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT_WAIT_TIMEOUT_SECONDS = 600
+
+_TRUTHY_FORM_VALUES = frozenset({"1", "true", "yes", "on"})
+
+# Database URLs whose schema has already been upgraded in this process.
+_verified_schema_urls: set[str] = set()
 
 # Database handle is created globally so unit tests can import the ``db`` object
 # without instantiating the Flask application first.
@@ -265,7 +346,31 @@ db = SQLAlchemy()
 
 
 def _load_openai_config() -> Optional[Dict[str, str]]:
-    """Read API credentials from ``openai_config.json`` if available."""
+    """Return API credentials from ``openai_config.json`` if available.
+
+    The file is only re-read when its modification time changes.
+    """
+    global _openai_config_cache
+
+    try:
+        stamp = _OPENAI_CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    except OSError as exc:  # pragma: no cover - IO failure
+        LOGGER.warning("Could not read OpenAI configuration: %s", exc)
+        return None
+
+    cached = _openai_config_cache
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    config = _read_openai_config()
+    _openai_config_cache = (stamp, config)
+    return config
+
+
+def _read_openai_config() -> Optional[Dict[str, str]]:
+    """Read and validate ``openai_config.json``."""
 
     try:
         raw_text = _OPENAI_CONFIG_PATH.read_text(encoding="utf-8")
@@ -303,7 +408,19 @@ def _get_openai_generator() -> OpenAIUnifiedGenerator:
 
     signature = (config["model"], config["api_key"])
     if _openai_generator is None or _openai_signature != signature:
-        _openai_generator = OpenAIUnifiedGenerator(*signature)
+        from api_handler import DEFAULT_MAX_CONCURRENT_REQUESTS, OpenAIUnifiedGenerator
+
+        try:
+            max_concurrent = int(
+                os.environ.get(
+                    "OPENAI_MAX_CONCURRENT_REQUESTS", DEFAULT_MAX_CONCURRENT_REQUESTS
+                )
+            )
+        except ValueError:
+            max_concurrent = DEFAULT_MAX_CONCURRENT_REQUESTS
+        _openai_generator = OpenAIUnifiedGenerator(
+            *signature, max_concurrent_requests=max_concurrent
+        )
         _openai_signature = signature
 
     return _openai_generator
@@ -318,31 +435,160 @@ def _resolve_text_generator(use_api: bool) -> TextGenerator | OpenAIUnifiedGener
     return _get_generator()
 
 
+def _generate_stage_response(
+    generator: TextGenerator | OpenAIUnifiedGenerator,
+    stage_key: str,
+    prompt: str,
+    *,
+    is_valid: Callable[[str], bool] | None = None,
+) -> str:
+    """Return the backend response for ``prompt``, reusing cached output.
+
+    Identical briefs are frequently resubmitted while iterating on a project.
+    When the backend is effectively deterministic the previous response is
+    returned instead of paying for another generation.  Only responses that
+    pass ``is_valid`` (by default: any non-blank text) are cached, so a
+    malformed reply is regenerated on retry rather than served again.
+    """
+
+    temperature = getattr(generator, "temperature", None)
+    if temperature is None or temperature > _RESPONSE_CACHE_MAX_TEMPERATURE:
+        return generator.generate_response(prompt) or ""
+
+    signature = _generator_signature(generator)
+    # Resolve the LocalProxy once rather than for each setting below.
+    config = current_app.config
+    key_prompt = prompt
+    if config.get("RESPONSE_CACHE_FUZZY_MATCH", False):
+        # Treat briefs that only differ in case, punctuation or spacing as the
+        # same request ("a heist story" vs "A heist story.").
+        key_prompt = _PROMPT_KEY_NOISE_PATTERN.sub(" ", prompt).casefold().strip()
+    cache_key = hashlib.sha256(
+        json.dumps([stage_key, key_prompt, signature], ensure_ascii=False).encode("utf-8")
+    ).digest()
+    ttl = config.get("RESPONSE_CACHE_TTL_SECONDS", DEFAULT_RESPONSE_CACHE_TTL_SECONDS)
+
+    now = time.monotonic()
+    with _RESPONSE_CACHE_LOCK:
+        cached = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            stored_at, cached_text = cached
+            if now - stored_at <= ttl:
+                _RESPONSE_CACHE.move_to_end(cache_key)
+                return cached_text
+            del _RESPONSE_CACHE[cache_key]
+
+    response = generator.generate_response(prompt) or ""
+    if response.strip() and (is_valid is None or is_valid(response)):
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[cache_key] = (now, response)
+            _RESPONSE_CACHE.move_to_end(cache_key)
+            while len(_RESPONSE_CACHE) > _RESPONSE_CACHE_MAX_ENTRIES:
+                _RESPONSE_CACHE.popitem(last=False)
+    return response
+
+
+def _generator_signature(generator: Any) -> List[Any]:
+    """Return the identifying settings of ``generator`` for cache keys."""
+
+    signature_fn = getattr(generator, "signature", None)
+    if callable(signature_fn):
+        return list(signature_fn())
+    return [type(generator).__name__]
+
+
+def _generate_single_flight(
+    generator: TextGenerator | OpenAIUnifiedGenerator,
+    prompt: str,
+    **generation_kwargs: Any,
+) -> str:
+    """Call ``generator`` unless an identical generation is already running.
+
+    Concurrent callers with the same backend, prompt and generation settings
+    wait for the first call and receive its result (or its exception) instead
+    of issuing a duplicate request.
+    """
+
+    key = hashlib.sha256(
+        json.dumps(
+            [prompt, _generator_signature(generator), sorted(generation_kwargs.items())],
+            ensure_ascii=False,
+            default=str,
+        ).encode("utf-8")
+    ).digest()
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT_GENERATIONS.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _INFLIGHT_GENERATIONS[key] = future
+
+    if not is_leader:
+        try:
+            return future.result(timeout=_INFLIGHT_WAIT_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            raise RuntimeError(
+                "An identical generation is still running; please try again shortly."
+            ) from None
+
+    try:
+        response = generator.generate_response(prompt, **generation_kwargs) or ""
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(response)
+        return response
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT_GENERATIONS.pop(key, None)
+
+
 def _is_api_requested(data: Mapping[str, Any]) -> bool:
     """Return True when the submitted form asks to use the API backend."""
 
     raw_value = data.get("use_api")
-    if raw_value is None:
-        return False
     if isinstance(raw_value, str):
-        return raw_value.strip().lower() in {"1", "true", "yes", "on"}
-    if isinstance(raw_value, (int, float)):
-        return bool(raw_value)
-    if isinstance(raw_value, (list, tuple)):
-        return any(_is_api_requested({"use_api": item}) for item in raw_value)
+        return raw_value.strip().lower() in _TRUTHY_FORM_VALUES
+    # JSON payloads send a boolean; anything else falls back to truthiness.
     return bool(raw_value)
 
 
+# The chapter patterns run against every line of every chapter response.
+# Possessive quantifiers (Python 3.11+) stop the engine from backtracking into
+# whitespace and digit runs that can never be part of the next token, so
+# non-matching summary lines fail fast.
 _CHAPTER_HEADER_PATTERN = re.compile(
-    r"^\s*Chapter\s*:\s*Chapter\s+(\d+)\s*[—–-]\s*(.*)$",
+    r"^\s*+Chapter\s*+:\s*+Chapter\s++(\d++)\s*+[—–-]\s*+(.*)$",
     re.IGNORECASE,
 )
 _LEGACY_CHAPTER_HEADING_PATTERN = re.compile(
-    r"^\s*Chapter\s+(\d+)\s*:\s*(.*)$",
+    r"^\s*+Chapter\s++(\d++)\s*+:\s*+(.*)$",
     re.IGNORECASE,
 )
-_TITLE_SPLIT_PATTERN = re.compile(r"\s*[—–-]\s*")
+_TITLE_SPLIT_PATTERN = re.compile(r"\s*+[—–-]\s*+")
 _ACT_SECTION_PATTERN = re.compile(r"(Act:\s.*?)(?=(?:\nAct:\s)|\Z)", re.DOTALL)
+_JSON_SCAN_PATTERN = re.compile(r'[{}"\\]')
+_PROMPT_KEY_NOISE_PATTERN = re.compile(r"[\W_]+")
+_PROMPT_PLACEHOLDER_PATTERN = re.compile(r"\{([A-Za-z_]\w*)\}")
+_CONCEPT_HEADING_PATTERN = re.compile(r"^[A-Z0-9][^:]{0,80}[:\-\u2013\u2014]\s+.+$")
+_CONCEPT_DEFINITION_SEPARATOR_PATTERN = re.compile(
+    r"^(?P<name>.+?)\s*(?:[:\-\u2013\u2014]\s+)(?P<definition>.+)$"
+)
+_EXAMPLES_HEADER_PATTERN = re.compile(r"examples?\s*[:\-]\s*(.*)", re.IGNORECASE)
+_CONCEPT_ISSUE_SEPARATOR_PATTERN = re.compile(
+    r"^(?P<name>.+?)\s*(?:[:\-\u2013\u2014]\s+)(?P<issue>.+)$"
+)
+_CONCEPT_ISSUE_KEYWORD_PATTERN = re.compile(
+    r"\b(is|are|needs|need|lacks|lack|requires|require|remains|seems)\b",
+    re.IGNORECASE,
+)
+_LIST_BULLET_PATTERN = re.compile(r"^[\-\*\u2022]+\s*")
+_LIST_NUMBER_PATTERN = re.compile(r"^\d+(?:[.)]|\s+)\s*")
+_INLINE_EXAMPLE_SEPARATOR_PATTERN = re.compile(r"[;\u2022\|]\s*")
+_INLINE_EXAMPLE_COMMA_PATTERN = re.compile(r",\s*(?=[A-Z0-9])")
+_CODE_FENCE_OPEN_PATTERN = re.compile(r"^```(?:json)?\s*", re.IGNORECASE)
+_CODE_FENCE_CLOSE_PATTERN = re.compile(r"\s*```$")
 
 
 class Project(db.Model):
@@ -444,85 +690,222 @@ class Concept(db.Model):
         return f"<Concept {self.id} project={self.project_id} {self.name!r}>"
 
 
-def _ensure_character_columns() -> None:
-    """Add missing columns required by the updated character schema."""
+# Columns added after the first release, mapped to their SQL type.  Existing
+# databases are upgraded in place by ``_ensure_schema_columns``.
+_CHARACTER_COLUMN_TYPES: Mapping[str, str] = {
+    "role_in_story": "VARCHAR(160)",
+    "physical_description": "TEXT",
+    "character_description": "TEXT",
+    "background": "TEXT",
+}
+
+_PROJECT_COLUMN_TYPES: Mapping[str, str] = {
+    "act1_outline": "TEXT",
+    "act2_outline": "TEXT",
+    "act3_outline": "TEXT",
+    "act_final_notes": "TEXT",
+    "act1_chapters": "TEXT",
+    "act2_chapters": "TEXT",
+    "act3_chapters": "TEXT",
+    "chapters_final_notes": "TEXT",
+    "act1_chapter_list": "TEXT",
+    "act2_chapter_list": "TEXT",
+    "act3_chapter_list": "TEXT",
+    "user_pitch": "TEXT",
+    "genre": "VARCHAR(120)",
+    "tone_mood": "TEXT",
+    "themes": "TEXT",
+    "stakes_level": "INTEGER",
+    "audience": "VARCHAR(120)",
+    "narrative_pace": "VARCHAR(120)",
+    "pov_style": "VARCHAR(120)",
+    "time_structure": "VARCHAR(120)",
+    "setting": "TEXT",
+    "world_realism": "VARCHAR(120)",
+    "seed_prompt": "TEXT",
+}
+
+
+# Applied to every new SQLite connection: WAL lets page loads read while a
+# generation result is being committed, and NORMAL sync avoids an fsync per
+# commit (safe under WAL).  The remaining settings keep hot pages in memory.
+_SQLITE_PRAGMAS: Tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _is_in_memory_sqlite(database_url: str) -> bool:
+    """Return True for SQLite URLs that point at a private in-memory database."""
+
+    return database_url.rstrip("/") == "sqlite:" or ":memory:" in database_url
+
 
-    inspector = inspect(db.engine)
+def _apply_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """Tune a freshly opened SQLite connection."""
+
+    cursor = dbapi_connection.cursor()
     try:
-        existing_columns = {
-            column["name"] for column in inspector.get_columns("character")
-        }
-    except Exception:  # pragma: no cover - defensive fallback
-        return
+        for statement in _SQLITE_PRAGMAS:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
 
-    alterations: List[str] = []
-    if "role_in_story" not in existing_columns:
-        alterations.append("ALTER TABLE character ADD COLUMN role_in_story VARCHAR(160)")
-    if "physical_description" not in existing_columns:
-        alterations.append("ALTER TABLE character ADD COLUMN physical_description TEXT")
-    if "character_description" not in existing_columns:
-        alterations.append("ALTER TABLE character ADD COLUMN character_description TEXT")
-    if "background" not in existing_columns:
-        alterations.append("ALTER TABLE character ADD COLUMN background TEXT")
-
-    if not alterations:
-        return
 
+def _check_sqlite_journal_mode() -> None:
+    """Warn when a pooled SQLite connection is not running in WAL mode.
+
+    A connection opened before ``_apply_sqlite_pragmas`` was registered stays
+    in the pool untuned; this makes that regression visible at start-up.
+    """
+
+    if db.engine.url.get_backend_name() != "sqlite":
+        return
     with db.engine.connect() as connection:
-        for statement in alterations:
-            connection.execute(text(statement))
-        connection.commit()
+        journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+    if str(journal_mode).lower() != "wal":
+        LOGGER.warning(
+            "SQLite connection reports journal_mode=%s; the start-up PRAGMAs "
+            "were not applied.",
+            journal_mode,
+        )
 
 
-def _ensure_project_columns() -> None:
-    """Add newly introduced project columns when they are missing."""
+# ``ALTER TABLE`` DDL for every upgradeable column, built once at import.
+_COLUMN_DDL: Mapping[str, Mapping[str, DDL]] = {
+    table_name: {
+        column_name: DDL(
+            f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
+        )
+        for column_name, column_type in column_types.items()
+    }
+    for table_name, column_types in (
+        ("character", _CHARACTER_COLUMN_TYPES),
+        ("project", _PROJECT_COLUMN_TYPES),
+    )
+}
+
+# Fingerprint of the upgradeable columns, derived from ``_COLUMN_DDL`` so it
+# changes whenever a column is added.  SQLite databases record it in
+# ``PRAGMA user_version`` (a signed 32-bit integer, 0 for new files) so later
+# start-ups with an unchanged schema can skip reflecting the tables.
+_SCHEMA_VERSION = (
+    zlib.crc32(
+        json.dumps(
+            sorted(
+                str(ddl.statement)
+                for table_ddl in _COLUMN_DDL.values()
+                for ddl in table_ddl.values()
+            )
+        ).encode("utf-8")
+    )
+    & 0x7FFFFFFF
+) or 1
+
+
+def _missing_column_ddl(inspector: Any, table_name: str) -> List[DDL]:
+    """Return the ``ALTER TABLE`` DDL for columns absent from ``table_name``."""
 
-    inspector = inspect(db.engine)
     try:
         existing_columns = {
-            column["name"] for column in inspector.get_columns("project")
+            column["name"] for column in inspector.get_columns(table_name)
         }
     except Exception:  # pragma: no cover - defensive fallback
-        return
+        return []
+
+    return [
+        ddl
+        for column_name, ddl in _COLUMN_DDL[table_name].items()
+        if column_name not in existing_columns
+    ]
 
-    alterations: List[str] = []
-    column_specs = {
-        "act1_outline": "ALTER TABLE project ADD COLUMN act1_outline TEXT",
-        "act2_outline": "ALTER TABLE project ADD COLUMN act2_outline TEXT",
-        "act3_outline": "ALTER TABLE project ADD COLUMN act3_outline TEXT",
-        "act_final_notes": "ALTER TABLE project ADD COLUMN act_final_notes TEXT",
-        "act1_chapters": "ALTER TABLE project ADD COLUMN act1_chapters TEXT",
-        "act2_chapters": "ALTER TABLE project ADD COLUMN act2_chapters TEXT",
-        "act3_chapters": "ALTER TABLE project ADD COLUMN act3_chapters TEXT",
-        "chapters_final_notes": "ALTER TABLE project ADD COLUMN chapters_final_notes TEXT",
-        "act1_chapter_list": "ALTER TABLE project ADD COLUMN act1_chapter_list TEXT",
-        "act2_chapter_list": "ALTER TABLE project ADD COLUMN act2_chapter_list TEXT",
-        "act3_chapter_list": "ALTER TABLE project ADD COLUMN act3_chapter_list TEXT",
-        "user_pitch": "ALTER TABLE project ADD COLUMN user_pitch TEXT",
-        "genre": "ALTER TABLE project ADD COLUMN genre VARCHAR(120)",
-        "tone_mood": "ALTER TABLE project ADD COLUMN tone_mood TEXT",
-        "themes": "ALTER TABLE project ADD COLUMN themes TEXT",
-        "stakes_level": "ALTER TABLE project ADD COLUMN stakes_level INTEGER",
-        "audience": "ALTER TABLE project ADD COLUMN audience VARCHAR(120)",
-        "narrative_pace": "ALTER TABLE project ADD COLUMN narrative_pace VARCHAR(120)",
-        "pov_style": "ALTER TABLE project ADD COLUMN pov_style VARCHAR(120)",
-        "time_structure": "ALTER TABLE project ADD COLUMN time_structure VARCHAR(120)",
-        "setting": "ALTER TABLE project ADD COLUMN setting TEXT",
-        "world_realism": "ALTER TABLE project ADD COLUMN world_realism VARCHAR(120)",
-        "seed_prompt": "ALTER TABLE project ADD COLUMN seed_prompt TEXT",
-    }
 
-    for column_name, statement in column_specs.items():
-        if column_name not in existing_columns:
-            alterations.append(statement)
+def _ensure_schema_columns() -> None:
+    """Add newly introduced character and project columns when missing.
 
-    if not alterations:
+    Both tables are checked with a single reflection pass and any upgrades
+    are applied in one transaction.  Each database is only verified once per
+    process, and SQLite databases already at ``_SCHEMA_VERSION`` are not
+    reflected at all.
+    """
+
+    database_url = str(db.engine.url)
+    if database_url in _verified_schema_urls:
         return
 
-    with db.engine.connect() as connection:
-        for statement in alterations:
-            connection.execute(text(statement))
-        connection.commit()
+    is_sqlite = db.engine.url.get_backend_name() == "sqlite"
+    with db.engine.begin() as connection:
+        if (
+            not is_sqlite
+            or connection.exec_driver_sql("PRAGMA user_version").scalar()
+            != _SCHEMA_VERSION
+        ):
+            inspector = inspect(connection)
+            for table_name in _COLUMN_DDL:
+                for ddl in _missing_column_ddl(inspector, table_name):
+                    connection.execute(ddl)
+            if is_sqlite:
+                connection.exec_driver_sql(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    _verified_schema_urls.add(database_url)
+
+
+def _init_database() -> None:
+    """Create any missing tables and add newly introduced columns."""
+
+    db.create_all()
+    _ensure_schema_columns()
+
+
+def _sse_event(event: str, payload: Mapping[str, Any]) -> str:
+    """Format a server-sent event whose data is ``payload`` as JSON."""
+
+    return f"event: {event}\ndata: {_dump_json(payload)}\n\n"
+
+
+def _dump_json(value: Any) -> str:
+    """Serialise ``value`` to a JSON string for storage in a text column."""
+
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _load_json(text: str | bytes) -> Any:
+    """Parse JSON ``text``, using orjson when it is available.
+
+    Both parsers raise ``json.JSONDecodeError`` (orjson's error subclasses it).
+    """
+
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class _OrjsonJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes ``jsonify`` responses with orjson.
+
+    Types orjson cannot encode natively fall back to Flask's default
+    handler, and pretty-printing follows the same ``indent`` request Flask
+    makes in debug mode.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(
+            obj, default=kwargs.get("default", self.default), option=option
+        ).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
 
 def _serialise_tone_values(values: Sequence[str]) -> str:
@@ -533,13 +916,20 @@ def _serialise_tone_values(values: Sequence[str]) -> str:
 def _deserialise_tone_values(raw_value: Optional[str]) -> List[str]:
     if not raw_value:
         return []
+    return list(_parse_tone_values(raw_value))
+
+
+@lru_cache(maxsize=256)
+def _parse_tone_values(raw_value: str) -> Tuple[str, ...]:
+    # The project form checks ``tone_mood_list`` once per tone option, so the
+    # stored value is decoded once and copied out for each caller.
     try:
-        parsed = json.loads(raw_value)
+        parsed = _load_json(raw_value)
     except json.JSONDecodeError:
         parsed = None
     if isinstance(parsed, list):
-        return [str(item).strip() for item in parsed if str(item).strip()]
-    return [part.strip() for part in raw_value.split(",") if part.strip()]
+        return tuple(text for item in parsed if (text := str(item).strip()))
+    return tuple(text for part in raw_value.split(",") if (text := part.strip()))
 
 
 def _parse_theme_entries(raw_value: Optional[str]) -> List[str]:
@@ -607,13 +997,83 @@ def create_app() -> Flask:
         database_url = "sqlite:///book_pipeline.db"
     app.config["SQLALCHEMY_DATABASE_URI"] = database_url
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    if database_url.startswith("sqlite:") and not _is_in_memory_sqlite(database_url):
+        # Share a pool of long-lived connections across request threads so
+        # each request does not reopen the database (and its WAL files).
+        app.config.setdefault(
+            "SQLALCHEMY_ENGINE_OPTIONS",
+            {
+                "poolclass": QueuePool,
+                "pool_size": 5,
+                "max_overflow": 10,
+                "pool_recycle": 3600,
+                "connect_args": {"check_same_thread": False},
+            },
+        )
+    app.config.setdefault(
+        "RESPONSE_CACHE_TTL_SECONDS", DEFAULT_RESPONSE_CACHE_TTL_SECONDS
+    )
+    app.config.setdefault(
+        "RESPONSE_CACHE_FUZZY_MATCH",
+        os.environ.get("RESPONSE_CACHE_FUZZY_MATCH", "").strip().lower()
+        in _TRUTHY_FORM_VALUES,
+    )
 
     db.init_app(app)
 
+    # Register the PRAGMA listener before anything opens a connection:
+    # Flask-Session's SQLAlchemy store creates its table inside ``Session(app)``
+    # and the pool would otherwise keep that untuned connection.
+    with app.app_context():
+        if db.engine.url.get_backend_name() == "sqlite" and not event.contains(
+            db.engine, "connect", _apply_sqlite_pragmas
+        ):
+            event.listen(db.engine, "connect", _apply_sqlite_pragmas)
+
+    if orjson is not None:
+        app.json = _OrjsonJSONProvider(app)
+
+    if Session is not None:
+        # Store chat histories server-side; only the session id travels in the
+        # cookie, so long conversations are not re-signed and re-sent on every
+        # request.  SESSION_REDIS_URL (e.g. unix:///var/run/redis/redis.sock)
+        # moves them from the application database to Redis.
+        redis_url = os.environ.get("SESSION_REDIS_URL", "").strip()
+        if redis_url and redis is not None:
+            app.config.setdefault("SESSION_TYPE", "redis")
+            app.config.setdefault("SESSION_REDIS", redis.Redis.from_url(redis_url))
+        else:
+            if redis_url:
+                LOGGER.warning(
+                    "SESSION_REDIS_URL is set but the 'redis' package is not installed; "
+                    "storing sessions in the database instead."
+                )
+            app.config.setdefault("SESSION_TYPE", "sqlalchemy")
+            app.config.setdefault("SESSION_SQLALCHEMY", db)
+            # Unlike Redis, the database store has no TTL of its own; purge
+            # expired rows on roughly one request in this many.
+            app.config.setdefault("SESSION_CLEANUP_N_REQUESTS", 100)
+        Session(app)
+
+    # Deployments that run ``flask --app chat_interface init-db`` once can set
+    # AUTO_INIT_DB=0 so worker start-up skips table creation and reflection.
+    app.config.setdefault(
+        "AUTO_INIT_DB",
+        os.environ.get("AUTO_INIT_DB", "1").strip().lower() in _TRUTHY_FORM_VALUES,
+    )
+
     with app.app_context():
-        db.create_all()
-        _ensure_character_columns()
-        _ensure_project_columns()
+        if not _is_in_memory_sqlite(database_url):
+            _check_sqlite_journal_mode()
+        if app.config["AUTO_INIT_DB"]:
+            _init_database()
+
+    @app.cli.command("init-db")
+    def init_db_command() -> None:
+        """Create missing tables and upgrade older database schemas."""
+
+        _init_database()
+        click.echo("Database initialised.")
 
     @app.route("/", methods=["GET", "POST"])
     def dashboard() -> str:
@@ -631,23 +1091,34 @@ def create_app() -> Flask:
                 db.session.add(project)
                 db.session.commit()
                 return redirect(url_for("project_detail", project_id=project.id))
-        projects = Project.query.order_by(Project.created_at.desc()).all()
+        # The dashboard only shows each project's name, outline and creation
+        # date; skip the act, chapter and profile text columns.
+        projects = db.session.scalars(
+            select(Project)
+            .options(
+                load_only(Project.name, Project.outline, Project.created_at)
+            )
+            .order_by(Project.created_at.desc())
+        ).all()
         return render_template("dashboard.html", projects=projects, error=error)
 
     @app.route("/projects/<int:project_id>", methods=["GET", "POST"])
     def project_detail(project_id: int) -> str:
-        project = db.session.get(Project, project_id)
+        # The page renders both collections and most generation stages read
+        # the character roster, so load them alongside the project.
+        project = db.session.execute(
+            select(Project)
+            .where(Project.id == project_id)
+            .options(selectinload(Project.characters), selectinload(Project.concepts))
+        ).scalar_one_or_none()
         if project is None:
             abort(404)
 
-        session_key = _session_key(project_id)
-        history = session.setdefault(session_key, [])
-        act_session_key = _act_session_key(project_id)
-        act_history = session.setdefault(act_session_key, [])
-        chapter_session_key = _chapter_session_key(project_id)
-        chapter_history = session.setdefault(chapter_session_key, [])
-        concept_session_key = _concept_session_key(project_id)
-        concept_history = session.setdefault(concept_session_key, [])
+        history_keys = _history_session_keys(project_id)
+        session_key, act_session_key, chapter_session_key, concept_session_key = history_keys
+        history, act_history, chapter_history, concept_history = _session_histories(
+            history_keys
+        )
         error = None
         success = None
         act_error = None
@@ -732,7 +1203,9 @@ def create_app() -> Flask:
                         try:
                             generator = _resolve_text_generator(use_api_requested)
                             prompt_text = _build_seed_prompt_request(project)
-                            seed_text_raw = generator.generate_response(prompt_text)
+                            seed_text_raw = _generate_stage_response(
+                                generator, "seed_prompt", prompt_text
+                            )
                         except OpenAIAPIRateLimitError as exc:
                             seed_error = str(exc)
                         except RuntimeError as exc:
@@ -746,10 +1219,9 @@ def create_app() -> Flask:
                             seed_text = (seed_text_raw or "").strip()
                             project.seed_prompt = seed_text or None
                             db.session.commit()
-                            device_type = generator.get_compute_device() if generator else None
+                            _, device_sentence = _describe_device(generator)
                             seed_success = (
-                                "Seed prompt generated and saved."
-                                f"{_device_usage_sentence(device_type)}"
+                                f"Seed prompt generated and saved.{device_sentence}"
                             )
             else:
                 chat_type = request.form.get("chat_type", "outline")
@@ -796,26 +1268,20 @@ def create_app() -> Flask:
                             )
                             act_history.pop()
                         else:
-                            device_type = generator.get_compute_device()
-                            device_label = _normalise_device_label(device_type)
-                            device_sentence = _device_usage_sentence(device_type)
+                            device_label, device_sentence = _describe_device(generator)
                             acts = [
                                 act1_result.strip(),
                                 act2_result.strip(),
                                 act3_result.strip(),
                             ]
-                            labels = ["Act I", "Act II", "Act III"]
-                            for label, content in zip(labels, acts):
-                                response_text = (
-                                    f"{label} outline:\n{content or '(no reply)'}"
-                                )
-                                act_history.append(
-                                    {
-                                        "role": "assistant",
-                                        "content": response_text,
-                                        "device_type": device_label,
-                                    }
-                                )
+                            act_history.extend(
+                                {
+                                    "role": "assistant",
+                                    "content": f"{label} outline:\n{content or '(no reply)'}",
+                                    "device_type": device_label,
+                                }
+                                for label, content in zip(ACT_LABEL_SEQUENCE, acts)
+                            )
                             project.act_final_notes = user_message
                             project.act1_outline = acts[0] if acts else ""
                             project.act2_outline = acts[1] if len(acts) > 1 else ""
@@ -888,22 +1354,16 @@ def create_app() -> Flask:
                                 if chapter_debug_details:
                                     for entry in chapter_debug_details:
                                         LOGGER.info("Chapter generation debug: %s", entry)
-                                device_type = generator.get_compute_device()
-                                device_label = _normalise_device_label(device_type)
-                                device_sentence = _device_usage_sentence(device_type)
+                                device_label, device_sentence = _describe_device(generator)
                                 chapters = [result.strip() for result in chapter_texts]
-                                labels = ["Act I", "Act II", "Act III"]
-                                for label, content in zip(labels, chapters):
-                                    response_text = (
-                                        f"{label} chapters:\n{content or '(no reply)'}"
-                                    )
-                                    chapter_history.append(
-                                        {
-                                            "role": "assistant",
-                                            "content": response_text,
-                                            "device_type": device_label,
-                                        }
-                                    )
+                                chapter_history.extend(
+                                    {
+                                        "role": "assistant",
+                                        "content": f"{label} chapters:\n{content or '(no reply)'}",
+                                        "device_type": device_label,
+                                    }
+                                    for label, content in zip(ACT_LABEL_SEQUENCE, chapters)
+                                )
                                 project.chapters_final_notes = user_message
                                 project.act1_chapters = chapters[0] if chapters else ""
                                 project.act2_chapters = (
@@ -913,17 +1373,17 @@ def create_app() -> Flask:
                                     chapters[2] if len(chapters) > 2 else ""
                                 )
                                 project.act1_chapter_list = (
-                                    json.dumps(chapter_structures[0], ensure_ascii=False)
+                                    _dump_json(chapter_structures[0])
                                     if chapter_structures and len(chapter_structures) > 0
                                     else None
                                 )
                                 project.act2_chapter_list = (
-                                    json.dumps(chapter_structures[1], ensure_ascii=False)
+                                    _dump_json(chapter_structures[1])
                                     if chapter_structures and len(chapter_structures) > 1
                                     else None
                                 )
                                 project.act3_chapter_list = (
-                                    json.dumps(chapter_structures[2], ensure_ascii=False)
+                                    _dump_json(chapter_structures[2])
                                     if chapter_structures and len(chapter_structures) > 2
                                     else None
                                 )
@@ -962,10 +1422,12 @@ def create_app() -> Flask:
                         generator = None
                         try:
                             generator = _resolve_text_generator(use_api_requested)
+                            outline_prefix = _build_concept_prompt_prefix(outline_text)
                             analysis_results = _identify_unclear_concepts(
                                 generator,
                                 outline_text,
                                 additional_guidance,
+                                outline_prefix=outline_prefix,
                             )
                             definitions: List[Dict[str, Any]] = []
                             if analysis_results:
@@ -974,6 +1436,7 @@ def create_app() -> Flask:
                                     outline_text,
                                     analysis_results,
                                     additional_guidance,
+                                    outline_prefix=outline_prefix,
                                 )
                         except OpenAIAPIRateLimitError as exc:
                             concept_error = str(exc)
@@ -991,9 +1454,7 @@ def create_app() -> Flask:
                             )
                             concept_history.pop()
                         else:
-                            device_type = generator.get_compute_device()
-                            device_label = _normalise_device_label(device_type)
-                            device_sentence = _device_usage_sentence(device_type)
+                            device_label, device_sentence = _describe_device(generator)
                             analysis_message = _format_concept_analysis_summary(
                                 analysis_results
                             )
@@ -1030,7 +1491,6 @@ def create_app() -> Flask:
                                     "No unclear concepts were identified in the outline."
                                     f"{device_sentence}"
                                 )
-                            session.modified = True
                     session.modified = True
                 else:
                     if user_message:
@@ -1054,23 +1514,22 @@ def create_app() -> Flask:
                             )
                             history.pop()
                         else:
-                            device_type = generator.get_compute_device()
+                            device_label, device_sentence = _describe_device(generator)
                             assistant_reply = assistant_reply_raw or "(no reply)"
                             history.append(
                                 {
                                     "role": "assistant",
                                     "content": assistant_reply,
-                                    "device_type": _normalise_device_label(device_type),
+                                    "device_type": device_label,
                                 }
                             )
                             clean_outline = assistant_reply.strip()
                             if clean_outline and clean_outline != "(no reply)":
                                 project.outline = clean_outline
                                 db.session.commit()
-                                success_suffix = _device_usage_sentence(device_type)
                                 success = (
                                     "Outline updated from assistant."
-                                    f"{success_suffix}"
+                                    f"{device_sentence}"
                                 )
                         session.modified = True
                     else:
@@ -1110,6 +1569,85 @@ def create_app() -> Flask:
             realism_choices=REALISM_CHOICES,
         )
 
+    @app.route("/projects/<int:project_id>/outline/stream", methods=["POST"])
+    def project_outline_stream(project_id: int):
+        """Stream the outline assistant's reply as server-sent events.
+
+        ``token`` events carry text as it is decoded and a final ``done`` event
+        follows once the reply has been saved as the project outline and the
+        exchange recorded in the outline history.  The body is sent after the
+        session has been saved, so the history is written to the server-side
+        session store directly; with cookie sessions the endpoint declines and
+        the page falls back to the regular form post.
+        """
+
+        project = db.session.get(Project, project_id)
+        if project is None:
+            return jsonify({"error": "Project not found."}), 404
+
+        interface = current_app.session_interface
+        if isinstance(interface, SecureCookieSessionInterface):
+            return jsonify({"error": "Streaming needs server-side sessions."}), 501
+
+        user_message = request.form.get("message", "").strip()
+        if not user_message:
+            return jsonify({"error": "Please enter a message before sending."}), 400
+
+        # Make sure the session is stored (and its cookie set) before the body
+        # streams, so the exchange can be saved against it afterwards.
+        (history,) = _session_histories(_history_session_keys(project_id)[:1])
+        prompt = _build_outline_prompt(
+            project, [*history, {"role": "user", "content": user_message}]
+        )
+        try:
+            generator = _resolve_text_generator(_is_api_requested(request.form))
+        except RuntimeError as exc:
+            return jsonify({"error": str(exc)}), 500
+
+        app_obj = current_app._get_current_object()
+
+        def events() -> Iterator[str]:
+            chunks: List[str] = []
+            try:
+                stream = getattr(generator, "stream_response", None)
+                if callable(stream):
+                    pieces = stream(prompt)
+                else:  # API backend: the reply arrives in one piece
+                    pieces = iter([generator.generate_response(prompt) or ""])
+                for chunk in pieces:
+                    chunks.append(chunk)
+                    yield _sse_event("token", {"text": chunk})
+            except Exception as exc:
+                LOGGER.exception("Outline streaming failed for project %s", project_id)
+                yield _sse_event("error", {"error": str(exc)})
+                return
+
+            reply = "".join(chunks).strip() or "(no reply)"
+            device_label, _ = _describe_device(generator)
+            if reply != "(no reply)":
+                project.outline = reply
+                db.session.commit()
+            history.extend(
+                [
+                    {"role": "user", "content": user_message},
+                    {
+                        "role": "assistant",
+                        "content": reply,
+                        "device_type": device_label,
+                    },
+                ]
+            )
+            session.modified = True
+            # Flask saved the session before the body started streaming.
+            interface.save_session(app_obj, session, Response())
+            yield _sse_event("done", {"reply": reply, "device_type": device_label})
+
+        return Response(
+            stream_with_context(events()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     @app.route(
         "/projects/<int:project_id>/characters",
         methods=["POST"],
@@ -1136,18 +1674,12 @@ def create_app() -> Flask:
         methods=["GET", "POST"],
     )
     def character_detail(project_id: int, character_id: int) -> str:
-        project = db.session.get(Project, project_id)
-        if project is None:
-            abort(404)
-
-        character = Character.query.filter_by(
-            id=character_id, project_id=project_id
-        ).first()
-        if character is None:
+        found = _load_project_character(project_id, character_id)
+        if found is None:
             abort(404)
+        project, character = found
 
-        character_fields = get_character_fields()
-        input_fields = get_character_input_fields()
+        character_fields, input_fields, _ = _character_field_settings()
         form_key = _character_form_state_key(project_id, character_id)
 
         if request.method == "POST" and "reset_form" in request.form:
@@ -1190,32 +1722,25 @@ def create_app() -> Flask:
         methods=["POST"],
     )
     def character_generate(project_id: int, character_id: int):
-        project = db.session.get(Project, project_id)
-        if project is None:
-            return jsonify({"error": "Project not found."}), 404
-
-        character = Character.query.filter_by(
-            id=character_id, project_id=project_id
-        ).first()
-        if character is None:
+        found = _load_project_character(project_id, character_id)
+        if found is None:
+            # Only the error path pays for a second query to tell them apart.
+            if db.session.get(Project, project_id) is None:
+                return jsonify({"error": "Project not found."}), 404
             return jsonify({"error": "Character not found."}), 404
+        _, character = found
 
         payload = request.get_json(silent=True) or {}
         inputs_payload = payload.get("inputs")
-        use_api_requested = _is_api_requested({"use_api": payload.get("use_api")})
+        use_api_requested = _is_api_requested(payload)
         if not isinstance(inputs_payload, dict):
             return jsonify({"error": "Invalid request payload."}), 400
 
-        input_fields = get_character_input_fields()
+        character_fields, input_fields, input_keys = _character_field_settings()
         trimmed_inputs: Dict[str, str] = {}
-        for field in input_fields:
-            key = field["key"]
+        for key in input_keys:
             raw_value = inputs_payload.get(key, "")
-            if raw_value is None:
-                value_text = ""
-            else:
-                value_text = str(raw_value).strip()
-            trimmed_inputs[key] = value_text
+            trimmed_inputs[key] = "" if raw_value is None else str(raw_value).strip()
 
         name = trimmed_inputs.get("name", "")
         role = trimmed_inputs.get("role_in_story", "")
@@ -1231,8 +1756,6 @@ def create_app() -> Flask:
         session[form_key] = trimmed_inputs
         session.modified = True
 
-        character_fields = get_character_fields()
-
         try:
             generator = _resolve_text_generator(use_api_requested)
         except RuntimeError as exc:
@@ -1250,12 +1773,7 @@ def create_app() -> Flask:
                 500,
             )
 
-        config = SYSTEM_PROMPTS.get("character_creation", {})
-        base_prompt = config.get(
-            "base",
-            "You are a writing assistant and we want to create a character.",
-        )
-        json_rules = config.get("json_format_rules", "")
+        base_prompt, json_rules = _character_prompt_settings()
 
         try:
             profile_data, sections, assistant_reply = _run_character_profile_generation(
@@ -1320,49 +1838,211 @@ def create_app() -> Flask:
     return app
 
 
-def _get_generator() -> TextGenerator:
-    """Return a cached ``TextGenerator`` instance."""
+class _BatchingTextGenerator:
+    """Serialise access to a local ``TextGenerator`` and batch concurrent calls.
+
+    ``generate_response`` queues the prompt for a single background worker and
+    waits for the result.  The worker collects whatever arrives within a short
+    window and runs prompts with identical generation options through one
+    ``generate_responses`` call, so simultaneous users share a forward pass
+    instead of queueing behind each other.  Other attributes are forwarded to
+    the wrapped generator.
+    """
+
+    def __init__(
+        self,
+        generator: TextGenerator,
+        *,
+        window_seconds: float = _LOCAL_BATCH_WINDOW_SECONDS,
+        max_batch_size: int = _LOCAL_BATCH_MAX_SIZE,
+    ) -> None:
+        self._generator = generator
+        self._window_seconds = window_seconds
+        self._max_batch_size = max_batch_size
+        self._queue: "queue.Queue[Tuple[str, Dict[str, Any], Future[str]]]" = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._drain, name="local-generation", daemon=True
+        )
+        self._worker.start()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._generator, name)
+
+    def generate_response(self, prompt: str, **generation_kwargs: Any) -> str:
+        return self.submit(prompt, **generation_kwargs).result()
+
+    def submit(self, prompt: str, **generation_kwargs: Any) -> "Future[str]":
+        """Queue ``prompt`` and return a future resolving to the response."""
+
+        future: "Future[str]" = Future()
+        self._queue.put((prompt, generation_kwargs, future))
+        return future
+
+    def stream_response(self, prompt: str, **generation_kwargs: Any) -> Iterator[str]:
+        """Yield the response to ``prompt`` in chunks as the worker decodes it."""
+
+        sink: "queue.Queue[str | None]" = queue.Queue()
+        future = self.submit(prompt, stream_to=sink, **generation_kwargs)
+        while (chunk := sink.get()) is not None:
+            yield chunk
+        future.result()
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._window_seconds
+            while len(batch) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[Tuple[str, Dict[str, Any], "Future[str]"]]) -> None:
+        groups: Dict[str, List[Tuple[str, "Future[str]"]]] = {}
+        options: Dict[str, Dict[str, Any]] = {}
+        for prompt, generation_kwargs, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            key = repr(sorted(generation_kwargs.items()))
+            groups.setdefault(key, []).append((prompt, future))
+            options[key] = generation_kwargs
+
+        for key, items in groups.items():
+            generation_kwargs = options[key]
+            # The JSON stopping criterion tracks a single sequence and streamed
+            # prompts have their own sink, so those (and lone prompts) take the
+            # unbatched path.
+            if (
+                len(items) == 1
+                or generation_kwargs.get("stop_after_json")
+                or "stream_to" in generation_kwargs
+            ):
+                for prompt, future in items:
+                    self._run_single(prompt, generation_kwargs, future)
+                continue
+
+            try:
+                responses = self._generator.generate_responses(
+                    [prompt for prompt, _ in items], **generation_kwargs
+                )
+            except BaseException as exc:  # pragma: no cover - surfaced to callers
+                for _, future in items:
+                    future.set_exception(exc)
+            else:
+                for (_, future), response in zip(items, responses):
+                    future.set_result(response)
+
+    def _run_single(
+        self, prompt: str, generation_kwargs: Dict[str, Any], future: "Future[str]"
+    ) -> None:
+        sink = generation_kwargs.get("stream_to")
+        try:
+            if sink is None:
+                response = self._generator.generate_response(prompt, **generation_kwargs)
+            else:
+                options = {k: v for k, v in generation_kwargs.items() if k != "stream_to"}
+                chunks: List[str] = []
+                for chunk in self._generator.stream_response(prompt, **options):
+                    chunks.append(chunk)
+                    sink.put(chunk)
+                response = "".join(chunks).strip()
+        except BaseException as exc:  # pragma: no cover - surfaced to caller
+            future.set_exception(exc)
+        else:
+            future.set_result(response)
+        finally:
+            if sink is not None:
+                sink.put(None)
+
+
+def _get_generator() -> _BatchingTextGenerator:
+    """Return the cached, batching wrapper around the local ``TextGenerator``."""
 
     global _generator
-    if _generator is None:
-        model_path = os.environ.get("LOCAL_GPT_MODEL_PATH")
+    generator = _generator
+    if generator is not None:
+        return generator
+
+    # Loading the model takes a long time; make sure concurrent first
+    # requests wait for a single load instead of each starting their own.
+    with _generator_lock:
+        if _generator is None:
+            model_path = os.environ.get("LOCAL_GPT_MODEL_PATH")
+
+            if not model_path and os.name == "nt":
+                if DEFAULT_WINDOWS_MODEL_PATH.exists():
+                    model_path = str(DEFAULT_WINDOWS_MODEL_PATH)
+
+            if not model_path:
+                raise RuntimeError(
+                    "Set the LOCAL_GPT_MODEL_PATH environment variable to the directory "
+                    "containing your local Hugging Face model."
+                )
 
-        if not model_path and os.name == "nt":
-            if DEFAULT_WINDOWS_MODEL_PATH.exists():
-                model_path = str(DEFAULT_WINDOWS_MODEL_PATH)
+            from text_generator import TextGenerator
 
-        if not model_path:
-            raise RuntimeError(
-                "Set the LOCAL_GPT_MODEL_PATH environment variable to the directory "
-                "containing your local Hugging Face model."
-            )
+            generator_kwargs: Dict[str, Any] = {}
+            temperature_text = os.environ.get("LOCAL_GPT_TEMPERATURE", "").strip()
+            if temperature_text:
+                try:
+                    generator_kwargs["temperature"] = float(temperature_text)
+                except ValueError:
+                    LOGGER.warning(
+                        "Ignoring invalid LOCAL_GPT_TEMPERATURE value %r.",
+                        temperature_text,
+                    )
 
-        _generator = TextGenerator(model_path)
-    return _generator
+            _generator = _BatchingTextGenerator(
+                TextGenerator(model_path, **generator_kwargs)
+            )
+        return _generator
 
 
-def _act_session_key(project_id: int) -> str:
-    """Return the session key used for act outline conversations."""
+# Session key prefixes for the per-project conversations, in the order
+# returned by ``_history_session_keys``: outline, act, chapter and concept.
+_HISTORY_SESSION_KEY_PREFIXES: Tuple[str, ...] = (
+    "chat_history",
+    "act_chat_history",
+    "chapter_chat_history",
+    "concept_chat_history",
+)
 
-    return f"act_chat_history_{project_id}"
 
+@lru_cache(maxsize=1024)
+def _history_session_keys(project_id: int) -> Tuple[str, ...]:
+    """Return the session keys of every conversation stored for a project."""
 
-def _chapter_session_key(project_id: int) -> str:
-    """Return the session key used for chapter outline conversations."""
+    return tuple(f"{prefix}_{project_id}" for prefix in _HISTORY_SESSION_KEY_PREFIXES)
 
-    return f"chapter_chat_history_{project_id}"
 
+def _session_histories(keys: Sequence[str]) -> List[List[Dict[str, str]]]:
+    """Return the stored history list for each key, creating missing ones.
 
-def _concept_session_key(project_id: int) -> str:
-    """Return the session key used for concept development conversations."""
+    Missing histories are added together in a single ``session.update``.
+    """
 
-    return f"concept_chat_history_{project_id}"
+    histories: List[List[Dict[str, str]]] = []
+    missing: Dict[str, List[Dict[str, str]]] = {}
+    for key in keys:
+        stored = session.get(key)
+        if stored is None:
+            stored = missing[key] = []
+        histories.append(stored)
+    if missing:
+        session.update(missing)
+    return histories
 
 
 def _normalise_whitespace(value: str) -> str:
     """Collapse excessive whitespace in generated text."""
 
-    return re.sub(r"\s+", " ", value or "").strip()
+    # ``str.split`` with no separator splits on exactly the characters ``\s``
+    # matches and drops leading/trailing runs, so no regex pass is needed.
+    return " ".join((value or "").split())
 
 
 def _extract_title_summary(raw_content: str) -> Tuple[str, str]:
@@ -1380,15 +2060,24 @@ def _extract_title_summary(raw_content: str) -> Tuple[str, str]:
     return cleaned, ""
 
 
-def _parse_structured_chapter_entries(text: str) -> List[Dict[str, Any]]:
+class ChapterEntry(NamedTuple):
+    """A parsed chapter heading with its title and summary."""
+
+    number: int
+    title: str
+    summary: str
+
+
+def _parse_structured_chapter_entries(lines: Sequence[str]) -> List[ChapterEntry]:
     """Parse chapter entries that follow the new 'Chapter:' section format."""
 
-    entries: List[Dict[str, Any]] = []
+    entries: List[ChapterEntry] = []
     current: Dict[str, Any] | None = None
     found_header = False
+    match_header = _CHAPTER_HEADER_PATTERN.match
 
-    for line in text.splitlines():
-        match = _CHAPTER_HEADER_PATTERN.match(line)
+    for line in lines:
+        match = match_header(line)
         if match:
             found_header = True
             if current is not None:
@@ -1396,11 +2085,7 @@ def _parse_structured_chapter_entries(text: str) -> List[Dict[str, Any]]:
                     " ".join(current.get("summary_lines", []))
                 )
                 entries.append(
-                    {
-                        "number": current["number"],
-                        "title": current["title"],
-                        "summary": summary,
-                    }
+                    ChapterEntry(current["number"], current["title"], summary)
                 )
 
             number = int(match.group(1))
@@ -1423,13 +2108,7 @@ def _parse_structured_chapter_entries(text: str) -> List[Dict[str, Any]]:
 
     if current is not None:
         summary = _normalise_whitespace(" ".join(current.get("summary_lines", [])))
-        entries.append(
-            {
-                "number": current["number"],
-                "title": current["title"],
-                "summary": summary,
-            }
-        )
+        entries.append(ChapterEntry(current["number"], current["title"], summary))
 
     if not found_header:
         return []
@@ -1437,31 +2116,26 @@ def _parse_structured_chapter_entries(text: str) -> List[Dict[str, Any]]:
     return entries
 
 
-def _parse_legacy_chapter_entries(text: str) -> List[Dict[str, Any]]:
+def _parse_legacy_chapter_entries(lines: Sequence[str]) -> List[ChapterEntry]:
     """Parse chapter entries that follow the legacy single-line format."""
 
-    entries: List[Dict[str, Any]] = []
+    entries: List[ChapterEntry] = []
     current: Dict[str, Any] | None = None
+    match_heading = _LEGACY_CHAPTER_HEADING_PATTERN.match
 
-    for line in text.splitlines():
-        match = _LEGACY_CHAPTER_HEADING_PATTERN.match(line)
+    for line in lines:
+        match = match_heading(line)
         if match:
             if current is not None:
-                raw_value = _normalise_whitespace(current.get("raw", ""))
+                raw_value = _normalise_whitespace(" ".join(current["raw_parts"]))
                 title, summary = _extract_title_summary(raw_value)
-                entries.append(
-                    {
-                        "number": current["number"],
-                        "title": title,
-                        "summary": summary,
-                    }
-                )
+                entries.append(ChapterEntry(current["number"], title, summary))
 
             number = int(match.group(1))
             remainder = match.group(2).strip()
             current = {
                 "number": number,
-                "raw": remainder,
+                "raw_parts": [remainder] if remainder else [],
             }
             continue
 
@@ -1472,86 +2146,62 @@ def _parse_legacy_chapter_entries(text: str) -> List[Dict[str, Any]]:
         if not stripped:
             continue
 
-        raw_value = current.get("raw", "")
-        if raw_value:
-            raw_value = f"{raw_value} {stripped}"
-        else:
-            raw_value = stripped
-        current["raw"] = raw_value
+        current["raw_parts"].append(stripped)
 
     if current is not None:
-        raw_value = _normalise_whitespace(current.get("raw", ""))
+        raw_value = _normalise_whitespace(" ".join(current["raw_parts"]))
         title, summary = _extract_title_summary(raw_value)
-        entries.append(
-            {
-                "number": current["number"],
-                "title": title,
-                "summary": summary,
-            }
-        )
+        entries.append(ChapterEntry(current["number"], title, summary))
 
     return entries
 
 
-def _parse_chapter_entries(text: str) -> List[Dict[str, Any]]:
+def _parse_chapter_entries(text: str) -> List[ChapterEntry]:
     """Return structured chapter entries parsed from ``text``."""
 
     if not text:
         return []
 
-    structured = _parse_structured_chapter_entries(text)
+    # Split once; the legacy parser only runs when no structured header was
+    # found and reuses the same lines.
+    lines = text.splitlines()
+    structured = _parse_structured_chapter_entries(lines)
     if structured:
         return structured
 
-    return _parse_legacy_chapter_entries(text)
+    return _parse_legacy_chapter_entries(lines)
 
 
-def _serialise_chapter_entries(entries: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Reduce parsed entries to JSON serialisable dictionaries."""
+def _serialise_chapter_entries(entries: Sequence[ChapterEntry]) -> List[Dict[str, Any]]:
+    """Reduce parsed entries to JSON serialisable dictionaries.
 
-    serialised: List[Dict[str, Any]] = []
-    for entry in entries:
-        number = int(entry.get("number", 0) or 0)
-        title = _normalise_whitespace(str(entry.get("title", "")))
-        summary = _normalise_whitespace(str(entry.get("summary", "")))
-        serialised.append(
-            {
-                "number": number,
-                "title": title,
-                "summary": summary,
-            }
-        )
-    return serialised
+    Entries are normalised where they are ingested: the chapter parsers convert
+    each heading number to ``int`` and collapse whitespace in titles and
+    summaries, and ``_decode_chapter_list`` strips stored values.  The entries
+    handled here and by the renderer and validator are trusted as-is, and stay
+    ``ChapterEntry`` tuples everywhere except this JSON boundary.
+    """
+
+    return [entry._asdict() for entry in entries]
 
 
-def _render_chapter_entries(entries: Sequence[Dict[str, Any]]) -> str:
+def _render_chapter_entries(entries: Sequence[ChapterEntry]) -> str:
     """Format structured entries back into canonical chapter text."""
 
     sections: List[str] = []
     for entry in entries:
-        number = entry.get("number")
-        try:
-            number_int = int(number)
-        except (TypeError, ValueError):
-            continue
-
-        title = entry.get("title", "").strip()
-        summary = entry.get("summary", "").strip()
-        header_title = title if title else "Untitled Chapter"
-        header = f"Chapter: Chapter {number_int} — {header_title}".strip()
-
-        section_lines = [header]
-        if summary:
-            section_lines.append(summary)
-
-        sections.append("\n".join(section_lines).strip())
+        header = f"Chapter: Chapter {entry.number} — {entry.title or 'Untitled Chapter'}"
+        if entry.summary:
+            sections.append(f"{header}\n{entry.summary}")
+        else:
+            sections.append(header)
 
-    return "\n\n".join(sections).strip()
+    return "\n\n".join(sections)
 
 
 def _validate_chapter_outline(
     response: str, expected_count: int
-) -> Tuple[bool, List[Dict[str, Any]], str]:
+) -> Tuple[bool, List[ChapterEntry], str]:
     """Return whether ``response`` matches the required chapter format."""
 
     entries = _parse_chapter_entries(response)
@@ -1564,7 +2214,7 @@ def _validate_chapter_outline(
 
     seen_numbers: set[int] = set()
     for index, entry in enumerate(entries, start=1):
-        number = int(entry.get("number", 0) or 0)
+        number = entry.number
         if number in seen_numbers:
             return False, entries, f"chapter number {number} is duplicated"
         seen_numbers.add(number)
@@ -1574,9 +2224,7 @@ def _validate_chapter_outline(
                 entries,
                 f"chapter numbers must increase sequentially starting at 1 (found {number} at position {index})",
             )
-        title = entry.get("title", "").strip()
-        summary = entry.get("summary", "").strip()
-        if not title or not summary:
+        if not entry.title or not entry.summary:
             return (
                 False,
                 entries,
@@ -1588,16 +2236,34 @@ def _validate_chapter_outline(
 
 def _load_chapter_list(
     serialised: str | None, fallback_text: str | None
-) -> List[Dict[str, Any]]:
+) -> List[ChapterEntry]:
     """Deserialize stored chapter entries with parsing fallback."""
 
+    if not serialised and not fallback_text:
+        return []
+    return list(_parse_chapter_list(serialised, fallback_text))
+
+
+@lru_cache(maxsize=256)
+def _parse_chapter_list(
+    serialised: str | None, fallback_text: str | None
+) -> Tuple[ChapterEntry, ...]:
+    # Every project page render loads all three acts from unchanged column
+    # text, so the decoded entries are memoised on that text.  The entries are
+    # immutable, so callers can share them without copying.
+    return tuple(_decode_chapter_list(serialised, fallback_text))
+
+
+def _decode_chapter_list(
+    serialised: str | None, fallback_text: str | None
+) -> List[ChapterEntry]:
     if serialised:
         try:
-            data = json.loads(serialised)
+            data = _load_json(serialised)
         except (TypeError, json.JSONDecodeError):
             data = None
         if isinstance(data, list):
-            cleaned: List[Dict[str, Any]] = []
+            cleaned: List[ChapterEntry] = []
             for entry in data:
                 if not isinstance(entry, dict):
                     continue
@@ -1609,11 +2275,7 @@ def _load_chapter_list(
                 except (TypeError, ValueError):
                     continue
                 cleaned.append(
-                    {
-                        "number": number_int,
-                        "title": str(title).strip(),
-                        "summary": str(summary).strip(),
-                    }
+                    ChapterEntry(number_int, str(title).strip(), str(summary).strip())
                 )
             if cleaned:
                 return cleaned
@@ -1621,12 +2283,14 @@ def _load_chapter_list(
     if fallback_text:
         parsed = _parse_chapter_entries(fallback_text)
         if parsed:
-            return _serialise_chapter_entries(parsed)
+            # The parsers already collapse whitespace in titles and summaries,
+            # which is all the JSON round trip used to add.
+            return parsed
 
     return []
 
 
-def _collect_project_chapter_lists(project: Project) -> Dict[int, List[Dict[str, Any]]]:
+def _collect_project_chapter_lists(project: Project) -> Dict[int, List[ChapterEntry]]:
     """Return per-act chapter lists for template rendering."""
 
     return {
@@ -1647,7 +2311,7 @@ def _generate_single_act_chapters(
     chapters_per_act: int,
     *,
     max_attempts: int = 3,
-) -> Tuple[str, List[Dict[str, Any]], List[str], bool]:
+) -> Tuple[str, List[ChapterEntry], List[str], bool]:
     """Run chapter generation with validation and optional retries."""
 
     attempt = 0
@@ -1661,14 +2325,21 @@ def _generate_single_act_chapters(
         chapters_per_act,
     )
     last_response = ""
-    last_entries: List[Dict[str, Any]] = []
+    last_entries: List[ChapterEntry] = []
     debug_messages: List[str] = []
     attempt_start_overall = time.perf_counter()
 
     while attempt < max_attempts:
         attempt += 1
         attempt_start = time.perf_counter()
-        response = generator.generate_response(prompt) or ""
+        response = _generate_stage_response(
+            generator,
+            "chapter_outline",
+            prompt,
+            is_valid=lambda text: _validate_chapter_outline(
+                text.strip(), chapters_per_act
+            )[0],
+        )
         duration = time.perf_counter() - attempt_start
         response_clean = response.strip()
         is_valid, entries, error_message = _validate_chapter_outline(
@@ -1769,7 +2440,12 @@ def _generate_three_act_outline(
         character_context,
         notes_text,
     )
-    response = generator.generate_response(prompt) or ""
+    response = _generate_stage_response(
+        generator,
+        "act_outline",
+        prompt,
+        is_valid=lambda text: len(_split_act_sections(text.strip())) >= 3,
+    )
     response_clean = response.strip()
 
     act_sections = _split_act_sections(response_clean)
@@ -1860,11 +2536,17 @@ def _identify_unclear_concepts(
     generator: TextGenerator,
     outline_text: str,
     additional_guidance: str,
+    *,
+    outline_prefix: str | None = None,
 ) -> List[Dict[str, str]]:
     """Return concepts mentioned in the outline that need clarification."""
 
-    prompt = _build_concept_analysis_prompt(outline_text, additional_guidance)
-    response = generator.generate_response(prompt) or ""
+    prompt = _build_concept_analysis_prompt(
+        outline_text,
+        additional_guidance,
+        outline_prefix=outline_prefix,
+    )
+    response = _generate_single_flight(generator, prompt, stop_after_json=True)
     return _parse_concept_analysis(response)
 
 
@@ -1873,6 +2555,8 @@ def _define_core_concepts(
     outline_text: str,
     concepts: List[Dict[str, str]],
     additional_guidance: str,
+    *,
+    outline_prefix: str | None = None,
 ) -> List[Dict[str, Any]]:
     """Return refined definitions for the provided ``concepts``."""
 
@@ -1883,29 +2567,72 @@ def _define_core_concepts(
         outline_text,
         concepts,
         additional_guidance,
+        outline_prefix=outline_prefix,
     )
-    response = generator.generate_response(prompt) or ""
+    response = _generate_single_flight(generator, prompt, stop_after_json=True)
     return _parse_concept_definitions(response)
 
 
+@lru_cache(maxsize=None)
+def _character_prompt_settings() -> Tuple[str, str]:
+    """Return the ``character_creation`` base prompt and JSON rules.
+
+    Like the concept prompt settings, these come from static module data and
+    are resolved once rather than on every character generation request.
+    """
+
+    config = SYSTEM_PROMPTS.get("character_creation", {})
+    base_prompt = config.get(
+        "base",
+        "You are a writing assistant and we want to create a character.",
+    )
+    return base_prompt, config.get("json_format_rules", "")
+
+
+@lru_cache(maxsize=None)
+def _character_field_settings() -> Tuple[
+    Tuple[Mapping[str, Any], ...], Tuple[Mapping[str, Any], ...], Tuple[str, ...]
+]:
+    """Return the character fields, input fields and input keys.
+
+    ``get_character_fields`` and ``get_character_input_fields`` copy static
+    configuration on every call, so they are resolved once.  The cached field
+    definitions are shared across requests and therefore returned read-only.
+    """
+
+    input_fields = tuple(
+        MappingProxyType(dict(field)) for field in get_character_input_fields()
+    )
+    return (
+        tuple(MappingProxyType(dict(field)) for field in get_character_fields()),
+        input_fields,
+        tuple(field["key"] for field in input_fields),
+    )
+
+
+_CHARACTER_CONTEXT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("name", "Name"),
+    ("role_in_story", "Role in story"),
+    ("physical_description", "Physical description"),
+    ("character_description", "Character description"),
+    ("background", "Background"),
+)
+
+
 def _collect_character_context(characters: Iterable["Character"]) -> str:
     """Build a readable summary of all available character descriptions."""
 
-    entries: List[str] = []
-    for character in characters:
-        sections: List[str] = []
-        if character.name:
-            sections.append(f"Name: {character.name}")
-        if character.role_in_story:
-            sections.append(f"Role in story: {character.role_in_story}")
-        if character.physical_description:
-            sections.append(f"Physical description: {character.physical_description}")
-        if character.character_description:
-            sections.append(f"Character description: {character.character_description}")
-        if character.background:
-            sections.append(f"Background: {character.background}")
-        if sections:
-            entries.append("\n".join(sections))
+    entries = [
+        entry
+        for character in characters
+        if (
+            entry := "\n".join(
+                f"{label}: {value}"
+                for attribute, label in _CHARACTER_CONTEXT_FIELDS
+                if (value := getattr(character, attribute))
+            )
+        )
+    ]
 
     if not entries:
         return "No character descriptions available."
@@ -1919,12 +2646,11 @@ def _split_act_sections(response_text: str) -> List[str]:
     if not response_text:
         return []
 
-    matches = [
-        match.group(1).strip()
+    return [
+        section
         for match in _ACT_SECTION_PATTERN.finditer(response_text)
-        if match.group(1).strip()
+        if (section := match.group(1).strip())
     ]
-    return matches
 
 
 def _build_full_act_prompt(
@@ -1934,8 +2660,6 @@ def _build_full_act_prompt(
 ) -> str:
     """Construct a prompt requesting the complete three-act outline."""
 
-    act_labels = {1: "Act I", 2: "Act II", 3: "Act III"}
-
     config = SYSTEM_PROMPTS.get("act_outline", {})
     base_prompt = config.get(
         "base",
@@ -1970,7 +2694,7 @@ def _build_full_act_prompt(
     ]
 
     for act_number in (1, 2, 3):
-        label = act_labels.get(act_number, f"Act {act_number}")
+        label = ACT_LABELS.get(act_number, f"Act {act_number}")
         guidance = act_guidance_map.get(
             act_number,
             "Ensure the act fulfils its role in classic three-act structure.",
@@ -2000,6 +2724,77 @@ def _build_full_act_prompt(
     )
 
 
+@lru_cache(maxsize=64)
+def _compile_template(template: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split ``template`` into its literal chunks and placeholder names.
+
+    Prompt templates come from static configuration, so each one is parsed
+    once and later expansions only perform lookups and a join.
+    """
+
+    pieces = _PROMPT_PLACEHOLDER_PATTERN.split(template)
+    return tuple(pieces[0::2]), tuple(pieces[1::2])
+
+
+def _apply_template(template: str, values: Mapping[str, str]) -> str:
+    """Substitute ``{placeholder}`` fields in a configured prompt template.
+
+    Like ``str.format_map`` with a mapping whose ``__missing__`` returns the
+    field unchanged, unknown placeholders are kept verbatim; unlike
+    ``format_map``, other braces never raise, so templates may embed literal
+    JSON examples.
+    """
+
+    literals, fields = _compile_template(template)
+    if not fields:
+        return template
+
+    parts: List[str] = [literals[0]]
+    for name, literal in zip(fields, literals[1:]):
+        parts.append(values.get(name, "{" + name + "}"))
+        parts.append(literal)
+    return "".join(parts)
+
+
+@lru_cache(maxsize=8)
+def _format_act_outline_sections(act_outlines: Tuple[Tuple[int, str], ...]) -> str:
+    """Return the three-act context block shared by every chapter prompt.
+
+    Chapter generation builds one prompt per act plus one per validation
+    retry, all with the same act outlines; cache the formatted block so it
+    is assembled once per chapter run instead of for every prompt.
+    """
+
+    outline_sections: List[str] = []
+    for outline_act_number, outline_text_value in act_outlines:
+        outline_label = ACT_LABELS.get(
+            outline_act_number, f"Act {outline_act_number}"
+        )
+        cleaned_outline = outline_text_value.strip() or "(no outline provided)"
+        outline_sections.append(
+            f"{outline_label} outline:\n{cleaned_outline}"
+        )
+
+    if not outline_sections:
+        outline_sections.append("(no act outlines provided)")
+
+    return "\n\n".join(outline_sections)
+
+
+# Static closing block shared by every chapter outline prompt (including
+# validator retries); joined once instead of on each prompt build.
+_CHAPTER_PROMPT_REQUIREMENTS = "\n".join(
+    [
+        "Ensure chapter arcs build naturally from prior acts and prepare the next act where appropriate without jumping ahead.",
+        "",
+        "Formatting requirements:",
+        "- Begin each chapter section on a new line with the exact prefix 'Chapter:' followed by 'Chapter <number> — <Title>'.",
+        "- Place the 2-3 sentence summary immediately underneath the header as a single paragraph (no bullet points).",
+        "- Leave a blank line between chapter sections and do not add commentary before or after the list.",
+    ]
+)
+
+
 def _build_chapter_prompt(
     act_number: int,
     outline_text: str,
@@ -2013,8 +2808,7 @@ def _build_chapter_prompt(
 ) -> str:
     """Construct a prompt for the requested chapter-by-chapter outline."""
 
-    act_labels = {1: "Act I", 2: "Act II", 3: "Act III"}
-    label = act_labels.get(act_number, f"Act {act_number}")
+    label = ACT_LABELS.get(act_number, f"Act {act_number}")
 
     config = SYSTEM_PROMPTS.get("chapter_outline", {})
     base_prompt = config.get(
@@ -2041,41 +2835,14 @@ def _build_chapter_prompt(
         "Outline this act in exactly {chapter_count} chapters, ensuring each advances tension and character arcs.",
     )
 
-    try:
-        focus_line = focus_instructions.format(act_label=label)
-    except KeyError:
-        focus_line = focus_instructions
-
-    try:
-        count_line = count_instructions.format(
-            chapter_count=chapters_per_act, act_label=label
-        )
-    except KeyError:
-        count_line = count_instructions
-
-    try:
-        format_line = format_instructions.format(
-            chapter_count=chapters_per_act, act_label=label
-        )
-    except KeyError:
-        format_line = format_instructions
-
-    outline_sections: List[str] = []
-    for outline_act_number, outline_text_value in act_outlines:
-        outline_label = act_labels.get(
-            outline_act_number, f"Act {outline_act_number}"
-        )
-        cleaned_outline = outline_text_value.strip() or "(no outline provided)"
-        outline_sections.append(
-            f"{outline_label} outline:\n{cleaned_outline}"
-        )
-
-    if not outline_sections:
-        outline_sections.append("(no act outlines provided)")
+    template_values = {"act_label": label, "chapter_count": str(chapters_per_act)}
+    focus_line = _apply_template(focus_instructions, template_values)
+    count_line = _apply_template(count_instructions, template_values)
+    format_line = _apply_template(format_instructions, template_values)
 
     chapter_sections: List[str] = []
     for chapter_act_number, chapters_text in previous_chapters:
-        chapter_label = act_labels.get(
+        chapter_label = ACT_LABELS.get(
             chapter_act_number, f"Act {chapter_act_number}"
         )
         cleaned_chapters = chapters_text.strip() or "(no chapters available)"
@@ -2092,7 +2859,7 @@ def _build_chapter_prompt(
         outline_text or "No broad outline has been provided yet.",
         "",
         "Full three-act outline for context:",
-        "\n\n".join(outline_sections),
+        _format_act_outline_sections(tuple(act_outlines)),
         "",
         f"Focus on {label}. To reinforce the target, the act outline is repeated below:",
     ]
@@ -2127,12 +2894,7 @@ def _build_chapter_prompt(
             focus_line,
             count_line,
             format_line,
-            "Ensure chapter arcs build naturally from prior acts and prepare the next act where appropriate without jumping ahead.",
-            "",
-            "Formatting requirements:",
-            "- Begin each chapter section on a new line with the exact prefix 'Chapter:' followed by 'Chapter <number> — <Title>'.",
-            "- Place the 2-3 sentence summary immediately underneath the header as a single paragraph (no bullet points).",
-            "- Leave a blank line between chapter sections and do not add commentary before or after the list.",
+            _CHAPTER_PROMPT_REQUIREMENTS,
         ]
     )
 
@@ -2171,49 +2933,104 @@ def _build_chapter_prompt(
     )
 
 
+_CONCEPT_PROMPT_DEFAULTS: Mapping[str, str] = {
+    "context_prompt": (
+        "You are helping an author develop the core concepts of their story outline."
+    ),
+    "analysis_prompt": (
+        "You are a developmental editor who specialises in spotting vague or underspecified "
+        "story concepts. Carefully review the outline and list any notions that the author "
+        "mentions but does not clearly define."
+    ),
+    "analysis_schema": (
+        '{\n'
+        '  "concepts": [\n'
+        '    {\n'
+        '      "name": "Term or concept as written in the outline",\n'
+        '      "issue": "Why the current description is unclear or what needs clarification"\n'
+        '    }\n'
+        '  ]\n'
+        '}'
+    ),
+    "definition_prompt": (
+        "You are a worldbuilding specialist tasked with clarifying story concepts. For each concept, "
+        "write a concise but concrete definition that resolves ambiguities and fits the outline. Also "
+        "provide two or three illustrative examples when feasible."
+    ),
+    "definition_schema": (
+        '{\n'
+        '  "concepts": [\n'
+        '    {\n'
+        '      "name": "Concept name",\n'
+        '      "definition": "Clear definition",\n'
+        '      "examples": [\n'
+        '        "Short illustrative example"\n'
+        '      ]\n'
+        '    }\n'
+        '  ]\n'
+        '}'
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _concept_prompt_setting(key: str) -> str:
+    """Return a stripped ``concept_development`` prompt setting.
+
+    ``SYSTEM_PROMPTS`` is static module data, so the resolved value is
+    computed once per key rather than on every concept request.
+    """
+
+    config = SYSTEM_PROMPTS.get("concept_development", {})
+    return str(config.get(key, _CONCEPT_PROMPT_DEFAULTS[key])).strip()
+
+
+def _build_concept_prompt_prefix(outline_text: str) -> str:
+    """Return the outline block that opens both concept development prompts.
+
+    The analysis and definition passes send the same outline back to back.
+    Keeping it at the very start of both prompts, byte-for-byte identical,
+    lets API backends with automatic prompt-prefix caching reuse it on the
+    second call; only the pass-specific instructions follow it.
+
+    ``outline_text`` is expected to be stripped by the caller.
+    """
+
+    outline = "\n".join(line.rstrip() for line in outline_text.splitlines())
+    return "\n".join(
+        [
+            "System: " + _concept_prompt_setting("context_prompt"),
+            "Outline:",
+            outline or "(no outline provided)",
+        ]
+    )
+
+
 def _build_concept_analysis_prompt(
     outline_text: str,
     additional_guidance: str,
+    *,
+    outline_prefix: str | None = None,
 ) -> str:
-    """Construct a prompt that identifies vague concepts in an outline."""
+    """Construct a prompt that identifies vague concepts in an outline.
 
-    config = SYSTEM_PROMPTS.get("concept_development", {})
-    base_prompt = config.get(
-        "analysis_prompt",
-        (
-            "You are a developmental editor who specialises in spotting vague or underspecified "
-            "story concepts. Carefully review the outline and list any notions that the author "
-            "mentions but does not clearly define."
-        ),
-    )
-    schema_instructions = config.get(
-        "analysis_schema",
-        (
-            '{\n'
-            '  "concepts": [\n'
-            '    {\n'
-            '      "name": "Term or concept as written in the outline",\n'
-            '      "issue": "Why the current description is unclear or what needs clarification"\n'
-            '    }\n'
-            '  ]\n'
-            '}'
-        ),
-    )
+    ``outline_text`` and ``additional_guidance`` are expected to be stripped
+    already.  ``outline_prefix`` lets callers running both concept passes
+    reuse the block built by :func:`_build_concept_prompt_prefix`.
+    """
 
     user_sections: List[str] = [
         (
-            "Evaluate the outline below. Identify only the concepts, organisations, technologies, "
+            "Evaluate the outline above. Identify only the concepts, organisations, technologies, "
             "or other terms that are explicitly mentioned but feel ambiguous, contradictory, or "
             "underspecified."
         ),
-        "Outline:",
-        outline_text.strip() or "(no outline provided)",
     ]
-    if additional_guidance.strip():
+    if additional_guidance:
         user_sections.extend(
             [
                 "Author guidance to consider while evaluating the outline:",
-                additional_guidance.strip(),
+                additional_guidance,
             ]
         )
     user_sections.extend(
@@ -2222,11 +3039,15 @@ def _build_concept_analysis_prompt(
                 "Return a JSON object exactly matching the schema below. Include only concepts from the "
                 "outline. If nothing seems unclear, return an empty array."
             ),
-            schema_instructions.strip(),
+            _concept_prompt_setting("analysis_schema"),
         ]
     )
 
-    prompt_lines = ["System: " + base_prompt.strip(), "User:"]
+    prompt_lines = [
+        outline_prefix or _build_concept_prompt_prefix(outline_text),
+        "System: " + _concept_prompt_setting("analysis_prompt"),
+        "User:",
+    ]
     prompt_lines.extend(user_sections)
     prompt_lines.append("Assistant:")
     return "\n".join(prompt_lines)
@@ -2236,52 +3057,32 @@ def _build_concept_definition_prompt(
     outline_text: str,
     concepts: List[Dict[str, str]],
     additional_guidance: str,
+    *,
+    outline_prefix: str | None = None,
 ) -> str:
-    """Return a prompt that requests clear definitions for each concept."""
-
-    config = SYSTEM_PROMPTS.get("concept_development", {})
-    base_prompt = config.get(
-        "definition_prompt",
-        (
-            "You are a worldbuilding specialist tasked with clarifying story concepts. For each concept, "
-            "write a concise but concrete definition that resolves ambiguities and fits the outline. Also "
-            "provide two or three illustrative examples when feasible."
-        ),
-    )
-    schema_instructions = config.get(
-        "definition_schema",
-        (
-            '{\n'
-            '  "concepts": [\n'
-            '    {\n'
-            '      "name": "Concept name",\n'
-            '      "definition": "Clear definition",\n'
-            '      "examples": [\n'
-            '        "Short illustrative example"\n'
-            '      ]\n'
-            '    }\n'
-            '  ]\n'
-            '}'
-        ),
-    )
-
-    concept_summary = json.dumps(
-        {"concepts": concepts},
-        ensure_ascii=False,
-        indent=2,
+    """Return a prompt that requests clear definitions for each concept.
+
+    ``outline_text`` and ``additional_guidance`` are expected to be stripped
+    already.
+    """
+
+    # One compact object per line keeps the list readable for the model
+    # without spending prompt tokens on indentation.
+    concept_summary = (
+        '{"concepts": [\n'
+        + ",\n".join(json.dumps(entry, ensure_ascii=False) for entry in concepts)
+        + "\n]}"
     )
     user_sections: List[str] = [
-        "Use the outline and the concept issues below to craft precise definitions.",
-        "Outline:",
-        outline_text.strip() or "(no outline provided)",
+        "Use the outline above and the concept issues below to craft precise definitions.",
         "Concepts requiring clarification:",
         concept_summary,
     ]
-    if additional_guidance.strip():
+    if additional_guidance:
         user_sections.extend(
             [
                 "Additional author guidance to incorporate:",
-                additional_guidance.strip(),
+                additional_guidance,
             ]
         )
     user_sections.extend(
@@ -2290,22 +3091,37 @@ def _build_concept_definition_prompt(
                 "Respond with JSON matching the schema below. Keep definitions concrete, avoid reusing the "
                 "author's vague language, and list up to three vivid examples for each concept."
             ),
-            schema_instructions.strip(),
+            _concept_prompt_setting("definition_schema"),
         ]
     )
 
-    prompt_lines = ["System: " + base_prompt.strip(), "User:"]
+    prompt_lines = [
+        outline_prefix or _build_concept_prompt_prefix(outline_text),
+        "System: " + _concept_prompt_setting("definition_prompt"),
+        "User:",
+    ]
     prompt_lines.extend(user_sections)
     prompt_lines.append("Assistant:")
     return "\n".join(prompt_lines)
 
 
+def _clean_field(value: Any) -> str:
+    """Return ``value`` as stripped text, treating ``None`` as empty."""
+
+    # Model output is almost always a string; only coerce other types.
+    if isinstance(value, str):
+        return value.strip()
+    return "" if value is None else str(value).strip()
+
+
 def _parse_concept_analysis(raw_response: str) -> List[Dict[str, str]]:
     """Parse the analysis response into a list of concept issues."""
 
     cleaned = _strip_json_code_fences(raw_response)
-    json_block = _extract_json_object(cleaned)
-    if not json_block:
+    payload = _extract_json(
+        cleaned, "The assistant returned invalid JSON while analysing concepts."
+    )
+    if payload is None:
         fallback_items = _parse_plain_concept_analysis(cleaned)
         if fallback_items:
             return fallback_items
@@ -2313,18 +3129,6 @@ def _parse_concept_analysis(raw_response: str) -> List[Dict[str, str]]:
             "The assistant response did not contain the expected JSON object. Please try again."
         )
 
-    try:
-        payload = json.loads(json_block)
-    except json.JSONDecodeError as exc:
-        raise ValueError(
-            "The assistant returned invalid JSON while analysing concepts."
-        ) from exc
-
-    if not isinstance(payload, dict):
-        raise ValueError(
-            "The assistant response was not a JSON object. Please try again."
-        )
-
     items = payload.get("concepts", [])
     if items is None:
         return []
@@ -2337,11 +3141,10 @@ def _parse_concept_analysis(raw_response: str) -> List[Dict[str, str]]:
     for entry in items:
         if not isinstance(entry, dict):
             continue
-        name = str(entry.get("name", "")).strip()
-        issue = str(entry.get("issue", "")).strip()
+        name = _clean_field(entry.get("name"))
         if not name:
             continue
-        results.append({"name": name, "issue": issue})
+        results.append({"name": name, "issue": _clean_field(entry.get("issue"))})
     return results
 
 
@@ -2349,8 +3152,10 @@ def _parse_concept_definitions(raw_response: str) -> List[Dict[str, Any]]:
     """Parse the definition response from the assistant."""
 
     cleaned = _strip_json_code_fences(raw_response)
-    json_block = _extract_json_object(cleaned)
-    if not json_block:
+    payload = _extract_json(
+        cleaned, "The assistant returned invalid JSON while defining concepts."
+    )
+    if payload is None:
         fallback_items = _parse_plain_concept_definitions(cleaned)
         if fallback_items:
             return fallback_items
@@ -2358,18 +3163,6 @@ def _parse_concept_definitions(raw_response: str) -> List[Dict[str, Any]]:
             "The assistant response did not contain the expected JSON object. Please try again."
         )
 
-    try:
-        payload = json.loads(json_block)
-    except json.JSONDecodeError as exc:
-        raise ValueError(
-            "The assistant returned invalid JSON while defining concepts."
-        ) from exc
-
-    if not isinstance(payload, dict):
-        raise ValueError(
-            "The assistant response was not a JSON object. Please try again."
-        )
-
     items = payload.get("concepts", [])
     if items is None:
         return []
@@ -2382,21 +3175,18 @@ def _parse_concept_definitions(raw_response: str) -> List[Dict[str, Any]]:
     for entry in items:
         if not isinstance(entry, dict):
             continue
-        name = str(entry.get("name", "")).strip()
-        definition = str(entry.get("definition", "")).strip()
+        name = _clean_field(entry.get("name"))
+        if not name:
+            continue
+        definition = _clean_field(entry.get("definition"))
         examples_raw = entry.get("examples", [])
         examples: List[str] = []
         if isinstance(examples_raw, list):
-            for example in examples_raw:
-                if example is None:
-                    continue
-                examples.append(str(example).strip())
+            examples.extend(_clean_field(example) for example in examples_raw)
         elif isinstance(examples_raw, (str, int, float)):
             text = str(examples_raw).strip()
             if text:
                 examples.append(text)
-        if not name:
-            continue
         results.append(
             {
                 "name": name,
@@ -2447,6 +3237,12 @@ def _format_concept_definition_summary(concepts: List[Dict[str, Any]]) -> str:
     return "\n".join(lines).strip()
 
 
+def _concept_name_key(name: str) -> str:
+    """Return the key used to match a concept name across analysis passes."""
+
+    return name.strip().casefold()
+
+
 def _apply_concept_definitions(
     project: Project,
     issues: List[Dict[str, str]],
@@ -2455,20 +3251,23 @@ def _apply_concept_definitions(
     """Persist the refined concept definitions to the database."""
 
     issue_lookup = {
-        entry["name"].strip().lower(): entry.get("issue", "").strip()
+        _concept_name_key(entry["name"]): entry.get("issue", "").strip()
         for entry in issues
         if entry.get("name")
     }
-    for existing in list(project.concepts):
-        db.session.delete(existing)
-
+    seen_names: set[str] = set()
+    rows: List[Dict[str, Any]] = []
     for entry in concepts:
         name = entry.get("name", "").strip()
         if not name:
             continue
+        name_key = _concept_name_key(name)
+        if name_key in seen_names:
+            continue
         definition = entry.get("definition", "").strip()
         if not definition:
             continue
+        seen_names.add(name_key)
         examples_list = entry.get("examples", [])
         if isinstance(examples_list, list):
             examples_text = "\n".join(ex for ex in examples_list if ex)
@@ -2476,15 +3275,29 @@ def _apply_concept_definitions(
             examples_text = examples_list.strip()
         else:
             examples_text = ""
-        issue_text = issue_lookup.get(name.lower(), "")
-        concept = Concept(
-            project=project,
-            name=name,
-            issue=issue_text or None,
-            definition=definition,
-            examples=examples_text or None,
+        issue_text = issue_lookup.get(name_key, "")
+        rows.append(
+            {
+                "project_id": project.id,
+                "name": name,
+                "issue": issue_text or None,
+                "definition": definition,
+                "examples": examples_text or None,
+            }
         )
-        db.session.add(concept)
+
+    # Replace the project's concepts with one DELETE and one executemany
+    # INSERT rather than loading and deleting each mapped instance.  The new
+    # rows are not used as ORM objects before the caller commits, so the
+    # stale ``project.concepts`` collection is simply expired.
+    db.session.execute(
+        delete(Concept)
+        .where(Concept.project_id == project.id)
+        .execution_options(synchronize_session=False)
+    )
+    if rows:
+        db.session.execute(insert(Concept), rows)
+    db.session.expire(project, ["concepts"])
 
 
 def _run_character_profile_generation(
@@ -2508,22 +3321,18 @@ def _run_character_profile_generation(
     response = generator.generate_response(prompt) or ""
     profile_data = _parse_character_json(response, fields)
 
+    # Build the structured sections and the chat transcript in the same pass so
+    # each field's label and content are only looked up once.
     sections: List[Dict[str, str]] = []
+    reply_parts: List[str] = []
     for field in fields:
         key = field["key"]
+        label = field.get("label", key)
         content = profile_data.get(key, "").strip()
-        sections.append(
-            {
-                "key": key,
-                "label": field.get("label", key),
-                "content": content,
-            }
-        )
+        sections.append({"key": key, "label": label, "content": content})
+        reply_parts.append(f"{label}:\n{content or '(no response)'}")
 
-    assistant_reply = "\n\n".join(
-        f"{section['label']}:\n{section['content'] or '(no response)'}"
-        for section in sections
-    ).strip()
+    assistant_reply = "\n\n".join(reply_parts).strip()
 
     return profile_data, sections, assistant_reply
 
@@ -2625,24 +3434,14 @@ def _parse_character_json(
 
     fields = list(character_fields)
     cleaned = _strip_json_code_fences(raw_response)
-    json_block = _extract_json_object(cleaned)
-    if not json_block:
+    payload = _extract_json(
+        cleaned, "The assistant returned invalid JSON. Please try again."
+    )
+    if payload is None:
         raise ValueError(
             "The assistant response did not contain the expected JSON object. Please try again."
         )
 
-    try:
-        payload = json.loads(json_block)
-    except json.JSONDecodeError as exc:
-        raise ValueError(
-            "The assistant returned invalid JSON. Please try again."
-        ) from exc
-
-    if not isinstance(payload, dict):
-        raise ValueError(
-            "The assistant response was not a JSON object. Please try again."
-        )
-
     parsed: Dict[str, str] = {}
     expected_keys = [field["key"] for field in fields]
     missing = [key for key in expected_keys if key not in payload]
@@ -2664,36 +3463,35 @@ def _parse_character_json(
     return parsed
 
 
+def _strip_list_marker(line: str) -> str:
+    """Remove a leading bullet and/or list number from ``line``."""
+
+    return _LIST_NUMBER_PATTERN.sub("", _LIST_BULLET_PATTERN.sub("", line))
+
+
 def _parse_plain_concept_analysis(text: str) -> List[Dict[str, str]]:
     """Best-effort fallback parser for non-JSON concept analysis replies."""
 
     results: List[Dict[str, str]] = []
-    lines = [line.strip() for line in text.splitlines() if line.strip()]
-    if not lines:
-        return results
-
-    for raw_line in lines:
-        line = re.sub(r"^[\-\*\u2022]+\s*", "", raw_line)
-        line = re.sub(r"^\d+(?:[.)]|\s+)\s*", "", line)
+    match_separator = _CONCEPT_ISSUE_SEPARATOR_PATTERN.match
+    search_keyword = _CONCEPT_ISSUE_KEYWORD_PATTERN.search
+    for raw_line in text.splitlines():
+        raw_line = raw_line.strip()
+        if not raw_line:
+            continue
+        line = _strip_list_marker(raw_line)
         if not line:
             continue
 
         name = ""
         issue = ""
 
-        separator_match = re.match(
-            r"^(?P<name>.+?)\s*(?:[:\-\u2013\u2014]\s+)(?P<issue>.+)$",
-            line,
-        )
+        separator_match = match_separator(line)
         if separator_match:
             name = separator_match.group("name").strip(' "')
             issue = separator_match.group("issue").strip()
         else:
-            keyword_match = re.search(
-                r"\b(is|are|needs|need|lacks|lack|requires|require|remains|seems)\b",
-                line,
-                flags=re.IGNORECASE,
-            )
+            keyword_match = search_keyword(line)
             if keyword_match:
                 name = line[: keyword_match.start()].strip(" -\u2013\u2014:.,")
                 issue = line[keyword_match.start() :].strip()
@@ -2717,21 +3515,18 @@ def _parse_plain_concept_definitions(text: str) -> List[Dict[str, Any]]:
         if not stripped:
             normalised_lines.append("")
             continue
-        stripped = re.sub(r"^[\-\*\u2022]+\s*", "", stripped)
-        stripped = re.sub(r"^\d+(?:[.)]|\s+)\s*", "", stripped)
-        normalised_lines.append(stripped)
-
-    heading_pattern = re.compile(r"^[A-Z0-9][^:]{0,80}[:\-\u2013\u2014]\s+.+$")
+        normalised_lines.append(_strip_list_marker(stripped))
 
     blocks: List[List[str]] = []
     current_block: List[str] = []
+    match_heading = _CONCEPT_HEADING_PATTERN.match
     for line in normalised_lines:
         if not line:
             if current_block:
                 blocks.append(current_block)
                 current_block = []
             continue
-        if current_block and heading_pattern.match(line):
+        if current_block and match_heading(line):
             blocks.append(current_block)
             current_block = [line]
         else:
@@ -2751,10 +3546,7 @@ def _parse_plain_concept_definitions(text: str) -> List[Dict[str, Any]]:
         definition_parts: List[str] = []
         examples: List[str] = []
 
-        separator_match = re.match(
-            r"^(?P<name>.+?)\s*(?:[:\-\u2013\u2014]\s+)(?P<definition>.+)$",
-            first_line,
-        )
+        separator_match = _CONCEPT_DEFINITION_SEPARATOR_PATTERN.match(first_line)
         if separator_match:
             name = separator_match.group("name").strip(' "')
             initial_definition = separator_match.group("definition").strip()
@@ -2767,7 +3559,12 @@ def _parse_plain_concept_definitions(text: str) -> List[Dict[str, Any]]:
 
         collecting_examples = False
         for line in remaining_lines:
-            header_match = re.match(r"examples?\s*[:\-]\s*(.*)", line, flags=re.IGNORECASE)
+            # Cheap prefix test first; most lines are definition prose.
+            header_match = (
+                _EXAMPLES_HEADER_PATTERN.match(line)
+                if line[:7].casefold().startswith("example")
+                else None
+            )
             if header_match:
                 collecting_examples = True
                 inline = header_match.group(1).strip()
@@ -2802,9 +3599,9 @@ def _split_inline_examples(text: str) -> List[str]:
 
     if not text:
         return []
-    parts = re.split(r"[;\u2022\|]\s*", text)
+    parts = _INLINE_EXAMPLE_SEPARATOR_PATTERN.split(text)
     if len(parts) == 1:
-        parts = re.split(r",\s*(?=[A-Z0-9])", text)
+        parts = _INLINE_EXAMPLE_COMMA_PATTERN.split(text)
     return [part.strip() for part in parts if part.strip()]
 
 
@@ -2813,43 +3610,69 @@ def _strip_json_code_fences(text: str) -> str:
 
     cleaned = text.strip()
     if cleaned.startswith("```"):
-        cleaned = re.sub(r"^```(?:json)?\s*", "", cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\s*```$", "", cleaned)
+        cleaned = _CODE_FENCE_OPEN_PATTERN.sub("", cleaned)
+        cleaned = _CODE_FENCE_CLOSE_PATTERN.sub("", cleaned)
         cleaned = cleaned.strip()
     return cleaned
 
 
+def _extract_json(text: str, invalid_message: str) -> Dict[str, Any] | None:
+    """Decode the first JSON object embedded in ``text``.
+
+    Only the first balanced ``{...}`` slice is parsed, so stray prose around
+    the object does not discard the response.  Returns ``None`` when no
+    object is present so callers can fall back to plain-text parsing.
+    Malformed JSON raises ``ValueError`` with ``invalid_message``.
+    """
+
+    json_block = _extract_json_object(text)
+    if not json_block:
+        return None
+
+    try:
+        payload = _load_json(json_block)
+    except json.JSONDecodeError as exc:
+        raise ValueError(invalid_message) from exc
+
+    if not isinstance(payload, dict):
+        raise ValueError(
+            "The assistant response was not a JSON object. Please try again."
+        )
+    return payload
+
+
 def _extract_json_object(text: str) -> str | None:
     """Return the first JSON object found in ``text`` or ``None``."""
 
-    start = None
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    # Only braces, quotes and backslashes affect the scan, so let the regex
+    # engine skip over ordinary characters instead of stepping through them.
     depth = 0
     in_string = False
-    escape = False
-    for index, char in enumerate(text):
-        if start is None:
-            if char == "{":
-                start = index
-                depth = 1
+    skip_until = -1
+    for match in _JSON_SCAN_PATTERN.finditer(text, start):
+        index = match.start()
+        if index < skip_until:
             continue
+        char = match.group()
 
         if in_string:
-            if escape:
-                escape = False
-            elif char == "\\":
-                escape = True
+            if char == "\\":
+                skip_until = index + 2
             elif char == '"':
                 in_string = False
             continue
 
         if char == '"':
             in_string = True
-            continue
-        if char == "{":
+        elif char == "{":
             depth += 1
         elif char == "}":
             depth -= 1
-            if depth == 0 and start is not None:
+            if depth == 0:
                 return text[start : index + 1]
 
     return None
@@ -2880,17 +3703,46 @@ def _normalise_device_label(device_type: str | None) -> str:
     return label.upper()
 
 
-def _device_usage_sentence(device_type: str | None) -> str:
-    """Return a sentence fragment describing the compute backend used."""
+def _label_usage_sentence(label: str) -> str:
+    """Return a sentence fragment describing the compute backend ``label``."""
 
-    label = _normalise_device_label(device_type)
     if not label:
         return ""
     return f" Generated using the {label} backend."
 
 
+def _describe_device(generator: Any) -> Tuple[str, str]:
+    """Return the display label and usage sentence for ``generator``'s device.
+
+    The device is queried once and both strings are derived from the same
+    normalised label.  A missing generator yields empty strings.
+    """
+
+    if generator is None:
+        return "", ""
+    return _device_label_and_sentence(generator.get_compute_device())
+
+
+@lru_cache(maxsize=16)
+def _device_label_and_sentence(device_type: str | None) -> Tuple[str, str]:
+    """Return the label and usage sentence for a raw ``device_type`` string.
+
+    Only a handful of device strings ever occur, so both are formatted once.
+    """
+
+    label = _normalise_device_label(device_type)
+    return label, _label_usage_sentence(label)
+
+
+@lru_cache(maxsize=None)
 def _compute_device_hint() -> str:
-    """Return a best-effort guess at the compute device available to the model."""
+    """Return a best-effort guess at the compute device available to the model.
+
+    Accelerator availability does not change while the process runs, so torch
+    is queried once and the answer reused for every page render.
+    """
+
+    import torch
 
     if torch.cuda.is_available():
         return "GPU"
@@ -2900,8 +3752,20 @@ def _compute_device_hint() -> str:
     return "CPU"
 
 
-def _session_key(project_id: int) -> str:
-    return f"chat_history_{project_id}"
+def _load_project_character(
+    project_id: int, character_id: int
+) -> Tuple[Project, Character] | None:
+    """Return a character and its project, fetched in one joined query."""
+
+    row = db.session.execute(
+        select(Character, Project)
+        .join(Character.project)
+        .where(Character.id == character_id, Character.project_id == project_id)
+    ).first()
+    if row is None:
+        return None
+    character, project = row
+    return project, character
 
 
 def _character_form_state_key(project_id: int, character_id: int) -> str:
@@ -60,6 +60,10 @@ SYSTEM_PROMPTS = {
         ),
     },
     "concept_development": {
+        "context_prompt": (
+            "You are helping an author develop the core concepts of their story. The complete outline is "
+            "provided below; refer back to it when answering the request that follows."
+        ),
         "analysis_prompt": (
             "You are a developmental editor hunting for vague or under-specified terminology inside story outlines. "
             "Highlight only the concepts that the author explicitly mentions but does not yet define clearly."
@@ -22,11 +22,18 @@ agnostic of the underlying model.
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
+)
 
 try:  # ``BitsAndBytesConfig`` requires an optional dependency (bitsandbytes).
     from transformers import BitsAndBytesConfig  # type: ignore
@@ -37,6 +44,56 @@ except ImportError:  # pragma: no cover - transformers should always provide thi
 LOGGER = logging.getLogger(__name__)
 
 
+class _JsonObjectStoppingCriteria(StoppingCriteria):
+    """Stop generation once the first top-level JSON object has closed.
+
+    Prompts that ask for a single JSON object have everything they need as
+    soon as the closing brace is produced; anything the model emits after
+    that is discarded by the parsers anyway.  Only the newly generated
+    tokens are decoded on each step and fed through a small brace/string
+    scanner, so the check stays proportional to the output length.
+    """
+
+    def __init__(self, tokenizer: Any, prompt_length: int) -> None:
+        self._tokenizer = tokenizer
+        self._consumed = prompt_length
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._closed = False
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor, **kwargs: Any):
+        if not self._closed:
+            new_ids = input_ids[0, self._consumed :]
+            self._consumed = input_ids.shape[-1]
+            self._feed(self._tokenizer.decode(new_ids, skip_special_tokens=True))
+        return torch.full(
+            (input_ids.shape[0],), self._closed, dtype=torch.bool, device=input_ids.device
+        )
+
+    def _feed(self, text: str) -> None:
+        for char in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if char == "{":
+                self._depth += 1
+            elif self._depth == 0:
+                continue
+            elif char == '"':
+                self._in_string = True
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._closed = True
+                    return
+
+
 class TextGenerator:
     def __init__(
         self,
@@ -50,6 +107,7 @@ class TextGenerator:
         use_4bit: bool = True,
         trust_remote_code: bool = False,
     ):
+        self.model_name = model_path
         self.temperature = temperature
         self.top_p = top_p
         self.max_new_tokens = max_new_tokens
@@ -145,11 +203,12 @@ class TextGenerator:
 
     def _generate(
         self,
-        prompt: str,
+        prompt: str | Sequence[str],
         *,
         max_new_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
+        stop_after_json: bool = False,
         **extra_parameters: Any,
     ):
         """Generate token ids for ``prompt``.
@@ -157,11 +216,15 @@ class TextGenerator:
         Parameters
         ----------
         prompt:
-            The prompt text used as input for the model.
+            The prompt text used as input for the model, or a list of prompts
+            to run as one left-padded batch.
         max_new_tokens:
             Optional override for the number of new tokens to generate. When
             not provided the generator wide default configured at
             instantiation time is used.
+        stop_after_json:
+            End generation as soon as the first top-level JSON object in the
+            output is closed.
         """
         tokens_to_generate = self.max_new_tokens if max_new_tokens is None else max_new_tokens
         if tokens_to_generate <= 0:
@@ -179,7 +242,15 @@ class TextGenerator:
             **extra_parameters,
         )
 
-        enc = self.tokenizer(prompt, return_tensors="pt").to(self.model.device)
+        if isinstance(prompt, str):
+            enc = self.tokenizer(prompt, return_tensors="pt")
+        else:
+            enc = self.tokenizer(list(prompt), return_tensors="pt", padding=True)
+        enc = enc.to(self.model.device)
+        if stop_after_json:
+            generation_kwargs["stopping_criteria"] = StoppingCriteriaList(
+                [_JsonObjectStoppingCriteria(self.tokenizer, enc["input_ids"].shape[-1])]
+            )
         if torch.cuda.is_available():
             torch.cuda.synchronize()
         t0 = time.perf_counter()
@@ -199,11 +270,15 @@ class TextGenerator:
         top_p: Optional[float],
         **extra_parameters: Any,
     ) -> Dict[str, Any]:
+        temperature = self.temperature if temperature is None else temperature
+        # A temperature of zero means greedy decoding; Hugging Face rejects
+        # non-positive temperatures when sampling.
+        do_sample = temperature is None or temperature > 0
         kwargs: Dict[str, Any] = {
             "max_new_tokens": max_new_tokens,
-            "temperature": self.temperature if temperature is None else temperature,
-            "top_p": self.top_p if top_p is None else top_p,
-            "do_sample": True,
+            "temperature": temperature if do_sample else None,
+            "top_p": (self.top_p if top_p is None else top_p) if do_sample else None,
+            "do_sample": do_sample,
             "pad_token_id": self.tokenizer.pad_token_id,
         }
 
@@ -254,14 +329,20 @@ class TextGenerator:
         max_new_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         top_p: Optional[float] = None,
+        stop_after_json: bool = False,
         **extra_parameters: Any,
     ) -> str:
-        """Generate a response to ``prompt`` without echoing it back."""
+        """Generate a response to ``prompt`` without echoing it back.
+
+        Set ``stop_after_json`` for prompts that expect a single JSON object
+        so decoding ends once that object is complete.
+        """
         enc, out = self._generate(
             prompt,
             max_new_tokens=max_new_tokens,
             temperature=temperature,
             top_p=top_p,
+            stop_after_json=stop_after_json,
             **extra_parameters,
         )
         prompt_len = enc["input_ids"].shape[-1]
@@ -271,6 +352,79 @@ class TextGenerator:
         response_text = self.tokenizer.decode(generated_ids, skip_special_tokens=True)
         return response_text.strip()
 
+    def stream_response(
+        self,
+        prompt: str,
+        *,
+        max_new_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        **extra_parameters: Any,
+    ) -> Iterator[str]:
+        """Yield decoded text for ``prompt`` as it is generated.
+
+        Generation runs on a helper thread feeding a ``TextIteratorStreamer``;
+        chunks are yielded as soon as the tokenizer can decode them, so the
+        first words arrive after the prompt has been processed rather than
+        once the whole reply is complete.
+        """
+        streamer = TextIteratorStreamer(
+            self.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        failure: List[BaseException] = []
+
+        def run() -> None:
+            try:
+                self._generate(
+                    prompt,
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    top_p=top_p,
+                    streamer=streamer,
+                    **extra_parameters,
+                )
+            except BaseException as exc:  # pragma: no cover - re-raised below
+                failure.append(exc)
+                streamer.end()
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        for text in streamer:
+            if text:
+                yield text
+        worker.join()
+        if failure:
+            raise failure[0]
+
+    def generate_responses(
+        self,
+        prompts: Sequence[str],
+        *,
+        max_new_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        top_p: Optional[float] = None,
+        **extra_parameters: Any,
+    ) -> List[str]:
+        """Generate responses for several prompts in a single batched pass.
+
+        The tokenizer pads on the left, so every row's new tokens start at the
+        same offset and can be sliced off exactly as in ``generate_response``.
+        """
+        if not prompts:
+            return []
+        enc, out = self._generate(
+            prompts,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            **extra_parameters,
+        )
+        prompt_len = enc["input_ids"].shape[-1]
+        return [
+            self.tokenizer.decode(row[prompt_len:], skip_special_tokens=True).strip()
+            for row in out
+        ]
+
     def _detect_compute_device(self) -> str:
         """Return a human readable label describing the active compute device."""
 
@@ -290,3 +444,8 @@ class TextGenerator:
         """Expose the last known compute device label."""
 
         return self._compute_device_label
+
+    def signature(self) -> Tuple[str, Optional[float], int]:
+        """Identify the model and default settings, e.g. for response caches."""
+
+        return (self.model_name, self.temperature, self.max_new_tokens)